@@ -0,0 +1,87 @@
+import logging
+from typing import TYPE_CHECKING, Iterator, List, Tuple
+
+import config
+from frame_sampling import read_frame_range, sample_frames
+from model_pool import reset_ai_gym
+from pose_analysis import PoseFrame, monitor_frames
+
+if TYPE_CHECKING:
+    import cv2
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("fixed", "adaptive")
+
+
+def find_local_minima(angles: List[float], max_minima: int = config.ADAPTIVE_MAX_MINIMA) -> List[int]:
+    """Return positions of the deepest local minima of an angle curve, lowest angle first."""
+    minima = [
+        i for i, angle in enumerate(angles)
+        # 180 means no person was detected in the frame
+        if angle < 180
+        and (i == 0 or angle <= angles[i - 1])
+        and (i == len(angles) - 1 or angle <= angles[i + 1])
+    ]
+    return sorted(minima, key=lambda i: angles[i])[:max_minima]
+
+
+def merge_windows(windows: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge overlapping [start, stop) frame windows."""
+    merged: List[Tuple[int, int]] = []
+    for start, stop in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def adaptive_search(
+    cap: "cv2.VideoCapture",
+    ai_gym,
+    coarse_step: int,
+    sampling_mode: str = config.DEFAULT_SAMPLING_MODE,
+    batch_size: int = config.DEFAULT_BATCH_SIZE,
+    fine_step: int = config.ADAPTIVE_FINE_STEP,
+    annotate: bool = True,
+) -> Iterator[PoseFrame]:
+    """
+    Coarse-to-fine search for the lowest knee angle.
+    Samples the video every `coarse_step` frames, then re-decodes every `fine_step` frames only
+    in the windows around the local minima of the coarse angle curve.
+    Yields a PoseFrame for every inferred frame.
+    """
+    import cv2
+
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    coarse_indices: List[int] = []
+    coarse_angles: List[float] = []
+
+    for pose_frame in monitor_frames(ai_gym, sample_frames(cap, coarse_step, sampling_mode), batch_size, annotate):
+        coarse_indices.append(pose_frame.frame_index)
+        coarse_angles.append(pose_frame.knee_angle)
+        yield pose_frame
+
+    if fine_step >= coarse_step:
+        return
+    if total_frames <= 0:
+        logger.warning("Frame count unavailable, skipping adaptive refinement")
+        return
+
+    minima = [coarse_indices[i] for i in find_local_minima(coarse_angles)]
+    windows = merge_windows([
+        (max(0, index - coarse_step + 1), min(total_frames, index + coarse_step))
+        for index in minima
+    ])
+    logger.info(f"Refining {len(windows)} window(s) around coarse minima at frames {minima}")
+
+    inferred = set(coarse_indices)
+    for start, stop in windows:
+        # Windows are not contiguous with the coarse pass, so start each one with a fresh tracker
+        reset_ai_gym(ai_gym)
+        window_frames = (
+            (frame_index, frame) for frame_index, frame in read_frame_range(cap, start, stop, fine_step)
+            if frame_index not in inferred
+        )
+        yield from monitor_frames(ai_gym, window_frames, batch_size, annotate)
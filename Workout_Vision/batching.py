@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RequestBatcher:
+    """
+    Group items submitted by concurrent tasks into chunks of up to `size` and process each chunk
+    with one `process(items)` call, which returns one result per item.
+
+    A chunk is sent as soon as it is full, or once every one of the `expected` tasks has either
+    submitted or called skip(), so no task waits for items that will never arrive.
+    """
+
+    def __init__(self, process: Callable[[List[Any]], Awaitable[List[Any]]], expected: int, size: int):
+        self.process = process
+        self.size = max(1, size)
+        self.remaining = expected
+        self.chunks = 0
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._tasks: List[asyncio.Task] = []
+
+    def submit(self, item: Any) -> "asyncio.Future":
+        """Queue an item and return a future for its result."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        self.remaining -= 1
+        self._flush()
+        return future
+
+    def skip(self) -> None:
+        """Record that one of the expected tasks will not submit an item."""
+        self.remaining -= 1
+        self._flush()
+
+    def _flush(self) -> None:
+        while len(self._pending) >= self.size or (self._pending and self.remaining <= 0):
+            chunk, self._pending = self._pending[:self.size], self._pending[self.size:]
+            self.chunks += 1
+            self._tasks.append(asyncio.create_task(self._run(chunk)))
+
+    async def _run(self, chunk: List[Tuple[Any, asyncio.Future]]) -> None:
+        try:
+            results = await self.process([item for item, _ in chunk])
+        except Exception as e:
+            logger.error(f"Error processing batch of {len(chunk)}: {str(e)}")
+            for _, future in chunk:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(chunk, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,82 @@
+"""
+Compare analyzing the videos of a session one at a time (as separate /analyze requests would)
+with analyzing them in one batch (as /analyze/batch does), offline with the same fakes as
+bench_pipeline.py. Vision and TTS latencies default to values typical of the real API, since
+combining vision requests is where most of the batch saving comes from.
+
+Usage:
+    python benchmarks/bench_batch.py [video.mp4 ...] [--count 8] [--vision-latency 4] [--tts-latency 1.5]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from bench_pipeline import install_fakes
+from common import make_synthetic_video, write_results
+from fake_storage import start_fake_storage
+
+import main
+from pose_backends import pose_backends
+
+
+async def sequential(paths, options) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        await main.process_and_analyze_video(path, options)
+    return time.perf_counter() - start
+
+
+async def batched(paths, options):
+    start = time.perf_counter()
+    results = await main.process_and_analyze_batch(paths, options)
+    return time.perf_counter() - start, results["summary"]
+
+
+async def compare(paths, options):
+    # Warm up so neither mode pays one-time initialization
+    await main.process_and_analyze_video(paths[0], options)
+    sequential_seconds = await sequential(paths, options)
+    batch_seconds, summary = await batched(paths, options)
+    return sequential_seconds, batch_seconds, summary
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="*", help="Local video files; synthetic clips are generated when none are given")
+    parser.add_argument("--count", type=int, default=8, help="Number of synthetic clips")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Length of each synthetic clip")
+    parser.add_argument("--frame-skip", type=int, default=5)
+    parser.add_argument("--pose-backend", default=pose_backends.default)
+    parser.add_argument("--vision-latency", type=float, default=4.0, help="Seconds the fake vision call takes")
+    parser.add_argument("--tts-latency", type=float, default=1.5, help="Seconds the fake TTS call takes")
+    parser.add_argument("--output", default="", help="Optional JSON output path")
+    args = parser.parse_args()
+
+    synthetic = [] if args.videos else [make_synthetic_video(seconds=args.seconds) for _ in range(args.count)]
+    paths = args.videos or synthetic
+
+    server = start_fake_storage()
+    install_fakes(server, args.vision_latency, args.tts_latency)
+    options = main.AnalysisOptions(frame_skip=args.frame_skip, pose_backend=args.pose_backend)
+    pose_backends.pool(args.pose_backend).load()
+    try:
+        sequential_seconds, batch_seconds, summary = asyncio.run(compare(paths, options))
+    finally:
+        server.shutdown()
+        for path in synthetic:
+            os.remove(path)
+
+    write_results({
+        "videos": len(paths),
+        "sequential_seconds": round(sequential_seconds, 4),
+        "batch_seconds": round(batch_seconds, 4),
+        "speedup": round(sequential_seconds / batch_seconds, 2) if batch_seconds else None,
+        "sequential_vision_requests": len(paths),
+        "batch_vision_requests": summary["vision_requests"],
+        "batch_failed": summary["failed"],
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main_cli()
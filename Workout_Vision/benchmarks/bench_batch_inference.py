@@ -0,0 +1,89 @@
+"""
+Measure pose inference frames/sec on CPU for several batch sizes and check that
+every batch size finds the same minimum knee angle as the per-frame tracking path,
+within a tolerance. Needs real videos with a person squatting in them: on a clip with
+nobody in it every path reports 180 degrees and the check means nothing.
+
+Usage:
+    python benchmarks/bench_batch_inference.py video.mp4 [...] [--batch-sizes 1,4,8,16] [--frame-skip 5] [--tolerance 2]
+"""
+import argparse
+
+import cv2
+
+from common import timed, write_results
+from frame_sampling import resolve_frame_step, sample_frames
+from model_pool import create_ai_gym, reset_ai_gym
+from pose_analysis import custom_monitor, custom_monitor_batch
+
+
+def load_frames(path: str, frame_skip: int):
+    cap = cv2.VideoCapture(path)
+    frames = [frame for _, frame in sample_frames(cap, resolve_frame_step(cap, frame_skip), "grab")]
+    cap.release()
+    return frames
+
+
+def run_tracking(ai_gym, frames) -> float:
+    return min((custom_monitor(ai_gym, frame.copy())[1] for frame in frames), default=float("inf"))
+
+
+def run(ai_gym, frames, batch_size: int) -> float:
+    min_angle = float("inf")
+    for start in range(0, len(frames), batch_size):
+        # Copy so annotation from a previous run does not leak into the next one
+        batch = [frame.copy() for frame in frames[start:start + batch_size]]
+        for _, knee_angle, _, _ in custom_monitor_batch(ai_gym, batch):
+            min_angle = min(min_angle, knee_angle)
+    return min_angle
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="+", help="Local video files with a person in them")
+    parser.add_argument("--batch-sizes", default="1,4,8,16")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="Degrees the minimum knee angles may differ by")
+    parser.add_argument("--frame-skip", type=int, default=5)
+    parser.add_argument("--output", default="", help="Optional JSON output path")
+    args = parser.parse_args()
+
+    ai_gym = create_ai_gym()
+    ai_gym.CFG["device"] = "cpu"
+    ai_gym.track_add_args["device"] = "cpu"
+
+    results = {}
+    for path in args.videos:
+        frames = load_frames(path, args.frame_skip)
+        # Warm up so the first batch size does not pay for model initialization
+        run(ai_gym, frames[:1], 1)
+
+        reset_ai_gym(ai_gym)
+        min_angle, elapsed = timed(run_tracking, ai_gym, frames)
+        results[path] = {
+            "frames": len(frames),
+            "per_frame_tracking": {
+                "seconds": round(elapsed, 4),
+                "frames_per_second": round(len(frames) / elapsed, 2) if elapsed else None,
+                "min_knee_angle": float(min_angle),
+            },
+        }
+        for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+            reset_ai_gym(ai_gym)
+            min_angle, elapsed = timed(run, ai_gym, frames, batch_size)
+            results[path][f"batch_{batch_size}"] = {
+                "seconds": round(elapsed, 4),
+                "frames_per_second": round(len(frames) / elapsed, 2) if elapsed else None,
+                "min_knee_angle": float(min_angle),
+            }
+        angles = [v["min_knee_angle"] for v in results[path].values() if isinstance(v, dict)]
+        # 180 means no person was detected, in which case there is nothing to compare
+        results[path]["person_detected"] = results[path]["per_frame_tracking"]["min_knee_angle"] < 180
+        results[path]["min_knee_angle_spread"] = round(max(angles) - min(angles), 2)
+        results[path]["min_knee_angle_agrees"] = (
+            results[path]["person_detected"] and results[path]["min_knee_angle_spread"] <= args.tolerance
+        )
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
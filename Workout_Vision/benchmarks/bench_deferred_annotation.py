@@ -0,0 +1,81 @@
+"""
+Compare CPU time and peak memory of annotating every sampled frame (and copying each new
+minimum) against the two-phase path that records angles only and annotates the winning frame.
+Needs real videos with a person in them: with nobody detected nothing is drawn on either path
+and the saving is not measured.
+
+Usage:
+    python benchmarks/bench_deferred_annotation.py video.mp4 [...] [--frame-skip 5]
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from common import write_results
+from frame_sampling import read_frame_at, sample_frames
+from joint_angles import joint_angle_engine
+from model_pool import create_ai_gym, reset_ai_gym
+from pose_analysis import annotate_frame, monitor_frames
+from pose_track import PoseTrack
+
+
+def eager(ai_gym, cap, frame_skip: int) -> Tuple[float, Optional[np.ndarray]]:
+    min_angle, best_frame = float("inf"), None
+    for pose_frame in monitor_frames(ai_gym, sample_frames(cap, frame_skip), annotate=True):
+        if pose_frame.knee_angle < min_angle:
+            min_angle = pose_frame.knee_angle
+            best_frame = pose_frame.frame.copy()
+    return min_angle, best_frame
+
+
+def deferred(ai_gym, cap, frame_skip: int) -> Tuple[float, Optional[np.ndarray]]:
+    track = PoseTrack(num_joints=len(joint_angle_engine.joints))
+    for pose_frame in monitor_frames(ai_gym, sample_frames(cap, frame_skip), annotate=False):
+        track.append(pose_frame.frame_index, pose_frame.knee_angle, pose_frame.joint_angles, pose_frame.keypoints)
+    best = track.best()
+    best_frame = annotate_frame(ai_gym, read_frame_at(cap, best.frame_index), best.keypoints)
+    return best.knee_angle, best_frame
+
+
+def measure(func, ai_gym, path: str, frame_skip: int):
+    reset_ai_gym(ai_gym)
+    cap = cv2.VideoCapture(path)
+    tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    min_angle, best_frame = func(ai_gym, cap, frame_skip)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    cap.release()
+    return {
+        "wall_seconds": round(wall, 4),
+        "cpu_seconds": round(cpu, 4),
+        "peak_traced_mb": round(peak / 1024 / 1024, 2),
+        "min_knee_angle": float(min_angle),
+        "best_frame_annotated": best_frame is not None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="+", help="Local video files with a person in them")
+    parser.add_argument("--frame-skip", type=int, default=5)
+    parser.add_argument("--output", default="", help="Optional JSON output path")
+    args = parser.parse_args()
+
+    ai_gym = create_ai_gym()
+    results = {}
+    for path in args.videos:
+        results[path] = {
+            "eager": measure(eager, ai_gym, path, args.frame_skip),
+            "deferred": measure(deferred, ai_gym, path, args.frame_skip),
+        }
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
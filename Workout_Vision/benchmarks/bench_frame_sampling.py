@@ -0,0 +1,49 @@
+"""
+Compare decode time per video for each frame sampling mode.
+
+Usage:
+    python benchmarks/bench_frame_sampling.py [video.mp4 ...] [--frame-skip 10] [--samples-per-second 3]
+"""
+import argparse
+
+import cv2
+
+from common import resolve_videos, timed, write_results
+from frame_sampling import SAMPLING_MODES, resolve_frame_step, sample_frames
+
+
+def decode(path: str, mode: str, frame_skip: int, samples_per_second: float) -> int:
+    cap = cv2.VideoCapture(path)
+    step = resolve_frame_step(cap, frame_skip, samples_per_second)
+    sampled = sum(1 for _ in sample_frames(cap, step, mode))
+    cap.release()
+    return sampled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="*", help="Local video files (defaults to a synthetic 720p clip)")
+    parser.add_argument("--frame-skip", type=int, default=10)
+    parser.add_argument("--samples-per-second", type=float, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="", help="Optional JSON output path")
+    args = parser.parse_args()
+
+    results = {}
+    for path in resolve_videos(args.videos):
+        results[path] = {}
+        for mode in SAMPLING_MODES:
+            timings = []
+            for _ in range(args.repeat):
+                sampled, elapsed = timed(decode, path, mode, args.frame_skip, args.samples_per_second)
+                timings.append(elapsed)
+            results[path][mode] = {
+                "sampled_frames": sampled,
+                "best_seconds": round(min(timings), 4),
+                "mean_seconds": round(sum(timings) / len(timings), 4),
+            }
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
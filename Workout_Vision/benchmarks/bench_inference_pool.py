@@ -0,0 +1,97 @@
+"""
+Measure pose inference frames/sec on CPU with 1 to N inference processes, against
+single-process inference with torch using all cores.
+
+Usage:
+    python benchmarks/bench_inference_pool.py [video.mp4 ...] [--workers 1,2,4] [--threads-per-worker 1] [--frame-skip 2]
+"""
+import argparse
+import os
+from collections import deque
+
+import cv2
+import torch
+
+import config
+from common import resolve_videos, timed, write_results
+from frame_sampling import resolve_frame_step, sample_frames
+from inference_pool import InferencePool
+from model_pool import create_ai_gym
+from pose_analysis import predict_args
+
+
+def load_frames(path: str, frame_skip: int):
+    cap = cv2.VideoCapture(path)
+    frames = [frame for _, frame in sample_frames(cap, resolve_frame_step(cap, frame_skip), "grab")]
+    cap.release()
+    return frames
+
+
+def run_in_process(ai_gym, frames) -> int:
+    args = predict_args(ai_gym)
+    return sum(len(ai_gym.model.predict(source=frame, **args)[0]) > 0 for frame in frames)
+
+
+def run_pool(pool: InferencePool, frames, args) -> int:
+    detected = 0
+    pending = deque()
+    for frame in frames:
+        pending.append(pool.submit(frame, args))
+        if len(pending) >= pool.capacity:
+            detected += pending.popleft().result() is not None
+    while pending:
+        detected += pending.popleft().result() is not None
+    return detected
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="*", help="Local video files (defaults to a synthetic 720p clip)")
+    parser.add_argument("--workers", default=",".join(str(n) for n in sorted({1, 2, max(1, cores // 2), cores})))
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--start-method", default=config.INFERENCE_START_METHOD)
+    parser.add_argument("--frame-skip", type=int, default=2)
+    parser.add_argument("--output", default="", help="Optional JSON output path")
+    args = parser.parse_args()
+
+    ai_gym = create_ai_gym()
+    ai_gym.CFG["device"] = "cpu"
+    ai_gym.track_add_args["device"] = "cpu"
+    model_args = predict_args(ai_gym)
+
+    videos = {path: load_frames(path, args.frame_skip) for path in resolve_videos(args.videos)}
+    results = {"cores": cores, "threads_per_worker": args.threads_per_worker}
+
+    for workers in [int(n) for n in args.workers.split(",")]:
+        pool = InferencePool(workers=workers, threads_per_worker=args.threads_per_worker, start_method=args.start_method)
+        pool.start()
+        try:
+            for path, frames in videos.items():
+                # Warm up every worker so the measurement excludes model initialization
+                run_pool(pool, frames[:pool.capacity], model_args)
+                detected, elapsed = timed(run_pool, pool, frames, model_args)
+                results.setdefault(path, {"frames": len(frames)})[f"workers_{workers}"] = {
+                    "seconds": round(elapsed, 4),
+                    "frames_per_second": round(len(frames) / elapsed, 2) if elapsed else None,
+                    "frames_with_people": int(detected),
+                    "startup_seconds": round(pool.load_seconds, 4),
+                }
+        finally:
+            pool.close()
+
+    # Baseline: one process letting torch use every core; runs last so forking happens before any inference here
+    torch.set_num_threads(cores)
+    for path, frames in videos.items():
+        run_in_process(ai_gym, frames[:1])
+        detected, elapsed = timed(run_in_process, ai_gym, frames)
+        results[path][f"in_process_{cores}_threads"] = {
+            "seconds": round(elapsed, 4),
+            "frames_per_second": round(len(frames) / elapsed, 2) if elapsed else None,
+            "frames_with_people": int(detected),
+        }
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Offline end-to-end benchmark and regression check of the full analysis pipeline.
+
+Runs process_and_analyze_video on synthetic clips at several resolutions and lengths (plus any
+given local videos), with OpenAI replaced by an in-process fake and storage uploads going to the
+local fake storage server, so no credentials or network are needed. Reports end-to-end latency,
+per-stage seconds, decode and inference frames/sec, peak RSS (of the process, plus how much each
+clip raised it) and model load time.
+
+With --baseline, compares against a previous results file and exits with status 1 when any
+metric is worse by more than --threshold (a fraction, e.g. 0.2 for 20%).
+
+Usage:
+    python benchmarks/bench_pipeline.py [video.mp4 ...] [--resolutions 480p,720p,1080p] [--lengths 5,20]
+        [--repeat 3] [--output results.json] [--baseline baseline.json] [--threshold 0.2]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from common import make_synthetic_video, write_results
+from fake_storage import start_fake_storage
+from fakes import fake_openai_client
+
+import main
+from metrics import FRAME_DECODE_SECONDS, FRAME_INFERENCE_SECONDS
+from pose_backends import pose_backends
+from storage import SupabaseStorage
+
+RESOLUTIONS = {"480p": (854, 480), "720p": (1280, 720), "1080p": (1920, 1080)}
+
+# Metric name -> True when higher is better
+TRACKED_METRICS = {
+    "end_to_end_seconds": False,
+    "video_stage_seconds": False,
+    "decode_frames_per_second": True,
+    "inference_frames_per_second": True,
+}
+
+
+def peak_rss_mb() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(usage / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def install_fakes(server, vision_latency: float, tts_latency: float) -> None:
+    """Point the pipeline at local fakes and turn off caches and checkpoints so every run does the full work."""
+    main.openai_client = fake_openai_client(vision_latency, tts_latency)
+    main.storage = SupabaseStorage(server.url, "bench-key", "bench")
+    main.result_cache = main.vision_cache = main.tts_cache = None
+    main.checkpoint_store = None
+    # The clips are local files rather than https URLs from an allowed domain
+    main.validate_video_url = lambda url: None
+
+
+def throughput(before: Tuple[int, float], after: Tuple[int, float]) -> float:
+    count, seconds = after[0] - before[0], after[1] - before[1]
+    return round(count / seconds, 2) if seconds > 0 else None
+
+
+async def run_clip(path: str, options, repeat: int) -> Dict[str, Any]:
+    # ru_maxrss is the process-wide peak so far, so a clip's own cost is how much it raised it
+    rss_before = peak_rss_mb()
+    runs: List[Dict[str, Any]] = []
+    for _ in range(repeat):
+        decode_before, inference_before = FRAME_DECODE_SECONDS.totals(), FRAME_INFERENCE_SECONDS.totals()
+        start = time.perf_counter()
+        result = await main.process_and_analyze_video(path, options)
+        elapsed = time.perf_counter() - start
+        runs.append({
+            "end_to_end_seconds": elapsed,
+            "stage_timings": result["stage_timings"],
+            "frames_inferred": result["frames_inferred"],
+            "decode_frames_per_second": throughput(decode_before, FRAME_DECODE_SECONDS.totals()),
+            "inference_frames_per_second": throughput(inference_before, FRAME_INFERENCE_SECONDS.totals()),
+        })
+
+    def median(key, values=None):
+        values = [v for v in (values if values is not None else [run[key] for run in runs]) if v is not None]
+        return round(statistics.median(values), 4) if values else None
+
+    stages = runs[0]["stage_timings"].keys()
+    return {
+        "frames_inferred": runs[0]["frames_inferred"],
+        "end_to_end_seconds": median("end_to_end_seconds"),
+        "video_stage_seconds": median(None, [run["stage_timings"].get("video") for run in runs]),
+        "stage_seconds": {stage: median(None, [run["stage_timings"][stage] for run in runs]) for stage in stages},
+        "decode_frames_per_second": median("decode_frames_per_second"),
+        "inference_frames_per_second": median("inference_frames_per_second"),
+        "peak_rss_growth_mb": round(peak_rss_mb() - rss_before, 1),
+    }
+
+
+async def run_all(clips: Dict[str, str], options, repeat: int) -> Dict[str, Any]:
+    # Warm up on the smallest clip so the first measurement excludes one-time initialization
+    await main.process_and_analyze_video(next(iter(clips.values())), options)
+    return {name: await run_clip(path, options, repeat) for name, path in clips.items()}
+
+
+def find_regressions(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """List every metric that is worse than the baseline by more than `threshold`."""
+    regressions = []
+
+    def check(name: str, current, previous, higher_is_better: bool) -> None:
+        if current is None or not previous:
+            return
+        change = (previous - current) / previous if higher_is_better else (current - previous) / previous
+        if change > threshold:
+            regressions.append(f"{name}: {previous} -> {current} ({change:+.0%} worse)")
+
+    check("model_load_seconds", results["model_load_seconds"], baseline.get("model_load_seconds"), False)
+    check("peak_rss_mb", results["peak_rss_mb"], baseline.get("peak_rss_mb"), False)
+    for clip, metrics in results["clips"].items():
+        previous = baseline.get("clips", {}).get(clip)
+        if previous is None:
+            continue
+        for metric, higher_is_better in TRACKED_METRICS.items():
+            check(f"{clip}.{metric}", metrics.get(metric), previous.get(metric), higher_is_better)
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="*", help="Extra local video files to include")
+    parser.add_argument("--resolutions", default="480p,720p,1080p", help=f"Synthetic clip resolutions among {', '.join(RESOLUTIONS)}")
+    parser.add_argument("--lengths", default="5,20", help="Synthetic clip lengths in seconds")
+    parser.add_argument("--frame-skip", type=int, default=5)
+    parser.add_argument("--pose-backend", default=pose_backends.default, help="Fixed pose backend, so runs stay comparable")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--vision-latency", type=float, default=0.0, help="Seconds the fake vision call takes")
+    parser.add_argument("--tts-latency", type=float, default=0.0, help="Seconds the fake TTS call takes")
+    parser.add_argument("--output", default="", help="Optional JSON output path")
+    parser.add_argument("--baseline", default="", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed fractional regression before failing")
+    args = parser.parse_args()
+
+    clips = {}
+    for resolution in args.resolutions.split(","):
+        width, height = RESOLUTIONS[resolution]
+        for seconds in [float(s) for s in args.lengths.split(",")]:
+            clips[f"{resolution}_{seconds:g}s"] = make_synthetic_video(width, height, seconds)
+    synthetic = list(clips.values())
+    for path in args.videos:
+        clips[os.path.basename(path)] = path
+
+    server = start_fake_storage()
+    install_fakes(server, args.vision_latency, args.tts_latency)
+    options = main.AnalysisOptions(frame_skip=args.frame_skip, pose_backend=args.pose_backend)
+
+    pool = pose_backends.pool(args.pose_backend)
+    pool.load()
+    try:
+        clip_results = asyncio.run(run_all(clips, options, args.repeat))
+    finally:
+        server.shutdown()
+        for path in synthetic:
+            os.remove(path)
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "pose_model": pool.model,
+            "options": options.model_dump(),
+        },
+        "model_load_seconds": round(pool.load_seconds, 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "clips": clip_results,
+    }
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.threshold)
+        results["regressions"] = regressions
+
+    write_results(results, args.output)
+    if results.get("regressions"):
+        print(f"{len(results['regressions'])} regression(s) past {args.threshold:.0%}:", file=sys.stderr)
+        for regression in results["regressions"]:
+            print(f"  {regression}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
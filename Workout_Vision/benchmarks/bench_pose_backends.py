@@ -0,0 +1,90 @@
+"""
+Compare pose backends on speed and accuracy: frames/sec and the minimum knee angle found per
+video, and how far each backend's minimum is from the first (most accurate) backend's.
+Needs real test videos with a person squatting in them: on a clip with nobody in it every
+backend reports 180 degrees and agrees trivially.
+
+Usage:
+    python benchmarks/bench_pose_backends.py video.mp4 [video.mp4 ...] [--backends medium,small,nano] [--frame-skip 5] [--tolerance 5]
+"""
+import argparse
+
+import cv2
+
+import config
+from common import timed, write_results
+from frame_sampling import resolve_frame_step, sample_frames
+from model_pool import create_ai_gym, reset_ai_gym
+from pose_analysis import custom_monitor
+from pose_backends import parse_backends
+
+
+def load_frames(path: str, frame_skip: int):
+    cap = cv2.VideoCapture(path)
+    frames = [frame for _, frame in sample_frames(cap, resolve_frame_step(cap, frame_skip), "grab")]
+    cap.release()
+    return frames
+
+
+def run(ai_gym, frames) -> float:
+    return min((custom_monitor(ai_gym, frame, annotate=False)[1] for frame in frames), default=180.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="+", help="Local test videos with a person in them")
+    parser.add_argument("--backends", default="", help="Comma-separated backend names from POSE_BACKENDS (default: all available)")
+    parser.add_argument("--frame-skip", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=5.0, help="Degrees within which minima count as agreeing")
+    parser.add_argument("--output", default="", help="Optional JSON output path")
+    args = parser.parse_args()
+
+    backends = [backend for backend in parse_backends(config.POSE_BACKENDS) if backend.available]
+    if args.backends:
+        names = args.backends.split(",")
+        backends = [backend for backend in backends if backend.name in names]
+    videos = {path: load_frames(path, args.frame_skip) for path in args.videos}
+
+    results = {}
+    for backend in backends:
+        ai_gym = create_ai_gym(backend.model)
+        ai_gym.CFG["device"] = "cpu"
+        ai_gym.track_add_args["device"] = "cpu"
+        # Warm up so the measurement excludes runtime initialization
+        run(ai_gym, next(iter(videos.values()))[:1])
+
+        for path, frames in videos.items():
+            reset_ai_gym(ai_gym)
+            min_angle, elapsed = timed(run, ai_gym, frames)
+            results.setdefault(path, {"frames": len(frames)})[backend.name] = {
+                "model": backend.model,
+                "runtime": backend.runtime,
+                "seconds": round(elapsed, 4),
+                "frames_per_second": round(len(frames) / elapsed, 2) if elapsed else None,
+                "min_knee_angle": round(float(min_angle), 2),
+            }
+
+    # Accuracy relative to the first backend, which POSE_BACKENDS orders as the most accurate
+    reference = backends[0].name if backends else None
+    for path in videos:
+        baseline = results[path][reference]["min_knee_angle"] if reference else None
+        # 180 means the reference found nobody, so agreement on this video says nothing
+        results[path]["person_detected"] = baseline is not None and baseline < 180
+        for backend in backends:
+            entry = results[path][backend.name]
+            entry["angle_error"] = round(abs(entry["min_knee_angle"] - baseline), 2)
+            entry["agrees"] = entry["angle_error"] <= args.tolerance
+
+    results["summary"] = {
+        backend.name: {
+            "mean_frames_per_second": round(sum(results[p][backend.name]["frames_per_second"] or 0 for p in videos) / len(videos), 2),
+            "mean_angle_error": round(sum(results[p][backend.name]["angle_error"] for p in videos) / len(videos), 2),
+            "agreement": sum(results[p][backend.name]["agrees"] for p in videos) / len(videos),
+        }
+        for backend in backends
+    }
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measure service startup: the cold import time of the service module (what a new worker pays
+before it can answer /healthz), compared with importing ultralytics directly, and the time from
+there until the service is ready (pose model load plus warmup).
+
+Each import is timed in a fresh interpreter so nothing is already cached in sys.modules.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from common import write_results
+
+SERVICE_DIR = str(Path(__file__).resolve().parent.parent)
+
+IMPORTS = {
+    "service": "import main",
+    "ultralytics": "import ultralytics",
+}
+
+
+def cold_import_seconds(statement: str) -> float:
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=SERVICE_DIR, capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def time_to_ready() -> dict:
+    """Import the service in this process, then start the inference processes and warm the models the way the lifespan does."""
+    start = time.perf_counter()
+    import main
+    from startup import warm_up
+
+    imported = time.perf_counter() - start
+    main.inference_pool.start()
+    pools = main.startup_pools()
+    warm_up(pools)
+    ready = time.perf_counter() - start
+    main.inference_pool.close()
+    return {
+        "import_seconds": round(imported, 4),
+        "model_load_seconds": round(sum(pool.load_seconds for pool in pools), 4),
+        "warmup_seconds": round(sum(pool.warmup_seconds for pool in pools), 4),
+        "ready_seconds": round(ready, 4),
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="", help="Optional JSON output path")
+    args = parser.parse_args()
+
+    results = {}
+    for name, statement in IMPORTS.items():
+        runs = [cold_import_seconds(statement) for _ in range(args.repeat)]
+        results[f"cold_import_{name}"] = {
+            "median_seconds": round(statistics.median(runs), 4),
+            "min_seconds": round(min(runs), 4),
+        }
+    results["time_to_ready"] = time_to_ready()
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main_cli()
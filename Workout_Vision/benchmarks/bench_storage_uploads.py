@@ -0,0 +1,92 @@
+"""
+Measure upload latency and connection reuse against the local fake storage server:
+uploads through the shared keep-alive client vs. a new client per upload, sequentially
+and concurrently, with optional server latency and injected 503s to exercise retries.
+
+Usage:
+    python benchmarks/bench_storage_uploads.py [--uploads 100] [--concurrency 8] [--size 200000] [--latency 0.01] [--fail-rate 0.05]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from common import write_results
+from fake_storage import start_fake_storage
+from http_clients import create_async_client
+from storage import SupabaseStorage
+
+
+async def upload_all(make_storage, uploads: int, concurrency: int, payload: bytes):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def upload(i: int) -> None:
+        async with semaphore:
+            storage, close = make_storage()
+            start = time.perf_counter()
+            await storage.upload(payload, f"bench_{i}.jpg", "image/jpeg")
+            latencies.append(time.perf_counter() - start)
+            await close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(upload(i) for i in range(uploads)))
+    return time.perf_counter() - start, latencies
+
+
+async def run(server, mode: str, uploads: int, concurrency: int, payload: bytes):
+    shared = create_async_client()
+
+    async def keep_open():
+        pass
+
+    def pooled():
+        return SupabaseStorage(server.url, "bench-key", "bench", client=shared), keep_open
+
+    def new_client():
+        client = httpx.AsyncClient()
+        return SupabaseStorage(server.url, "bench-key", "bench", client=client), client.aclose
+
+    server.reset_stats()
+    try:
+        elapsed, latencies = await upload_all(pooled if mode == "pooled" else new_client, uploads, concurrency, payload)
+    finally:
+        await shared.aclose()
+    latencies.sort()
+    return {
+        "seconds": round(elapsed, 4),
+        "uploads_per_second": round(uploads / elapsed, 2) if elapsed else None,
+        "latency_mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "latency_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        **server.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--size", type=int, default=200_000, help="Payload size in bytes")
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds the fake server adds per request")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--output", default="", help="Optional JSON output path")
+    args = parser.parse_args()
+
+    server = start_fake_storage(latency=args.latency, fail_rate=args.fail_rate)
+    payload = bytes(args.size)
+    results = {}
+    try:
+        for mode in ("new_client", "pooled"):
+            for concurrency in sorted({1, args.concurrency}):
+                results[f"{mode}_concurrency_{concurrency}"] = asyncio.run(
+                    run(server, mode, args.uploads, concurrency, payload)
+                )
+    finally:
+        server.shutdown()
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
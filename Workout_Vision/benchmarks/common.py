@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import cv2
+import numpy as np
+
+# Make the service modules importable when running `python benchmarks/<script>.py`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_synthetic_video(width: int = 1280, height: int = 720, seconds: float = 10.0, fps: float = 30.0) -> str:
+    """Write a synthetic MP4 clip with moving content to a temp file and return its path."""
+    fd, path = tempfile.mkstemp(suffix=".mp4", prefix=f"bench_{width}x{height}_")
+    os.close(fd)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+    for i in range(int(seconds * fps)):
+        frame = np.roll(background, i * 4, axis=1)
+        cv2.circle(frame, (width // 2, int(height / 2 + height / 4 * np.sin(i / 10))), height // 10, (255, 255, 255), -1)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def resolve_videos(paths: List[str]) -> List[str]:
+    """Return the given local videos, or a synthetic 720p clip when none are given."""
+    return paths or [make_synthetic_video()]
+
+
+def timed(func, *args, **kwargs):
+    """Call func and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def write_results(results: Dict[str, Any], output: str) -> None:
+    """Print results and optionally save them as JSON."""
+    print(json.dumps(results, indent=2))
+    if output:
+        Path(output).write_text(json.dumps(results, indent=2))
@@ -0,0 +1,111 @@
+"""
+Local stand-in for the Supabase storage REST API, for offline upload benchmarks.
+
+Accepts POST /storage/v1/object/<bucket>/<path> over HTTP/1.1 keep-alive, stores nothing,
+and counts requests and TCP connections so connection reuse can be measured.
+Optional per-request latency and a failure rate (503s) exercise retries.
+
+Usage:
+    python benchmarks/fake_storage.py [--port 9000] [--latency 0.02] [--fail-rate 0.1]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+
+
+class FakeStorageServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: float = 0.0, fail_rate: float = 0.0):
+        super().__init__(address, FakeStorageHandler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.failures = 0
+        self.bytes_received = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "connections": self.connections,
+                "requests": self.requests,
+                "failures": self.failures,
+                "bytes_received": self.bytes_received,
+            }
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.connections = self.requests = self.failures = self.bytes_received = 0
+
+
+class FakeStorageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _reply(self, status: int, body: Dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        failed = random.random() < self.server.fail_rate
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.bytes_received += length
+            self.server.failures += failed
+
+        if failed:
+            self._reply(503, {"error": "Service Unavailable"})
+        elif not self.path.startswith("/storage/v1/object/"):
+            self._reply(404, {"error": "Not Found"})
+        else:
+            self._reply(200, {"Key": self.path[len("/storage/v1/object/"):]})
+
+
+def start_fake_storage(port: int = 0, latency: float = 0.0, fail_rate: float = 0.0) -> FakeStorageServer:
+    """Start a fake storage server on a background thread and return it; call shutdown() to stop."""
+    server = FakeStorageServer(("127.0.0.1", port), latency, fail_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    server = FakeStorageServer(("127.0.0.1", args.port), args.latency, args.fail_rate)
+    print(f"Fake storage listening on {server.url}, set SUPABASE_URL to it")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+In-process stand-ins for OpenAI, for running the analysis pipeline offline.
+
+The fake OpenAI client is the real AsyncOpenAI with an httpx.MockTransport, so request
+building and response parsing run as in production; only the network is replaced.
+"""
+import asyncio
+import json
+
+import httpx
+import openai
+
+FAKE_ANALYSIS = """1. [SUMMARY]: The squat reaches good depth with a neutral spine.
+2. [IMPROVEMENTS]: Keep the knees tracking over the toes on the way up.
+3. [RISK FACTOR]: Low, the knee angle stays within a safe range."""
+
+FAKE_SESSION = "Depth is consistent across videos; keep the knees tracking over the toes in every set."
+
+# A few hundred bytes standing in for an MP3
+FAKE_AUDIO = b"ID3" + bytes(512)
+
+
+def fake_openai_client(vision_latency: float = 0.0, tts_latency: float = 0.0) -> openai.AsyncOpenAI:
+    """Create an AsyncOpenAI client answering chat completions and speech locally, after a fixed delay."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/chat/completions"):
+            await asyncio.sleep(vision_latency)
+            body = json.loads(request.content)
+            content = body["messages"][0]["content"]
+            if isinstance(content, str):
+                # Text-only session assessment over the per-video analyses
+                text = FAKE_SESSION
+            elif "### VIDEO" in content[0]["text"]:
+                # Combined request: one section per image
+                videos = sum(1 for part in content if part["type"] == "image_url")
+                text = "\n\n".join(f"### VIDEO {i + 1}\n{FAKE_ANALYSIS}" for i in range(videos))
+            else:
+                text = FAKE_ANALYSIS
+            return httpx.Response(200, json={
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+        if request.url.path.endswith("/audio/speech"):
+            await asyncio.sleep(tts_latency)
+            return httpx.Response(200, content=FAKE_AUDIO, headers={"content-type": "audio/mpeg"})
+        return httpx.Response(404, json={"error": {"message": f"Not faked: {request.url.path}"}})
+
+    return openai.AsyncOpenAI(
+        api_key="fake",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
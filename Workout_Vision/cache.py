@@ -0,0 +1,218 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+
+import config
+from http_clients import http_clients, with_retries_sync
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries: int = config.RESULT_CACHE_MAX_ENTRIES, ttl: int = config.RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteCache:
+    """
+    On-disk cache of JSON values that survives restarts, with a per-entry TTL.
+    The database file is only created when the cache is opened, by the lifespan or on first use.
+    """
+
+    def __init__(self, path: str = config.RESULT_CACHE_PATH, table: str = "results", ttl: int = config.RESULT_CACHE_TTL):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def open(self) -> sqlite3.Connection:
+        """Open the database, creating its directory and table if needed."""
+        with self._lock:
+            if self._conn is None:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                with conn:
+                    conn.execute(
+                        f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                    )
+                self._conn = conn
+            return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self.open()
+        with self._lock:
+            row = conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at < time.time():
+            with self._lock, conn:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        conn = self.open()
+        with self._lock, conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + self.ttl),
+            )
+
+
+class TieredCache:
+    """In-memory LRU in front of an optional on-disk store."""
+
+    def __init__(self, memory: MemoryCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def hash_key(*parts: Any) -> str:
+    """Build a stable cache key from JSON-serializable parts."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def fetch_video_validator(url: str) -> Optional[str]:
+    """Return the ETag (or Last-Modified and length) of a video so changed content gets a new key."""
+    try:
+        def head() -> requests.Response:
+            response = http_clients.session.head(url, timeout=config.HTTP_TIMEOUT, allow_redirects=True)
+            response.raise_for_status()
+            return response
+
+        response = with_retries_sync(head)
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Could not fetch video headers for cache key: {str(e)}")
+        return None
+
+    etag = response.headers.get("etag")
+    if etag:
+        return etag
+    last_modified = response.headers.get("last-modified")
+    content_length = response.headers.get("content-length")
+    if last_modified or content_length:
+        return f"{last_modified}:{content_length}"
+    return None
+
+
+def result_cache_key(video_url: str, validator: Optional[str], options: Dict[str, Any]) -> str:
+    """
+    Cache key of the requested analysis options. The pose model is not part of it: results are stored
+    under a key that adds the backend that actually ran (see main.backend_cache_key).
+    """
+    return hash_key(
+        video_url,
+        validator,
+        options,
+        config.OPENAI_VISION_MODEL,
+        config.VISION_PROMPT_VERSION,
+    )
+
+
+def vision_cache_key(prompt: str, image_base64: str) -> str:
+    """
+    Cache key for a vision analysis: the model, prompt and a digest of the exact image sent.
+    The encoded bytes differ for every upload and snapshot choice, so hits only come from the same
+    video yielding the same frame again: re-analyses with options that pick the same frame (frame skip,
+    sampling or search mode), a retry after a later stage failed, or the result cache having expired.
+    """
+    image_digest = hashlib.sha256(image_base64.encode("utf-8")).hexdigest()
+    return hash_key(
+        "vision",
+        config.OPENAI_VISION_MODEL,
+        config.OPENAI_VISION_MAX_TOKENS,
+        config.VISION_PROMPT_VERSION,
+        prompt,
+        image_digest,
+    )
+
+
+def tts_cache_key(text: str, voice: str) -> str:
+    """Cache key for generated speech."""
+    return hash_key("tts", config.OPENAI_TTS_MODEL, voice, text)
+
+
+def create_cache(backend: str, table: str, max_entries: int, ttl: int) -> Optional[TieredCache]:
+    """Create a memory or memory+SQLite cache, or None when the backend is 'none'."""
+    if backend == "none":
+        return None
+    disk = SQLiteCache(config.RESULT_CACHE_PATH, table, ttl) if backend == "sqlite" else None
+    logger.info(f"Cache '{table}' enabled with {backend} backend")
+    return TieredCache(MemoryCache(max_entries, ttl), disk)
+
+
+def create_result_cache() -> Optional[TieredCache]:
+    """Create the analysis result cache for the configured backend, or None when disabled."""
+    return create_cache(config.RESULT_CACHE_BACKEND, "results", config.RESULT_CACHE_MAX_ENTRIES, config.RESULT_CACHE_TTL)
+
+
+result_cache = create_result_cache()
+# Keyed by content: TTS text recurs across videos (e.g. the fixed fallback summary), vision images only
+# when the same video yields the same frame again, see vision_cache_key
+vision_cache = create_cache(config.OPENAI_CACHE_BACKEND, "vision", config.OPENAI_CACHE_MAX_ENTRIES, config.OPENAI_CACHE_TTL)
+tts_cache = create_cache(config.OPENAI_CACHE_BACKEND, "tts", config.OPENAI_CACHE_MAX_ENTRIES, config.OPENAI_CACHE_TTL)
+
+
+def open_caches() -> None:
+    """Create the on-disk caches at startup, so a bad path fails there rather than on the first request."""
+    for cache in (result_cache, vision_cache, tts_cache):
+        if cache is not None and cache.disk is not None:
+            cache.disk.open()
@@ -0,0 +1,107 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import config
+from image_utils import EncodedImage
+
+logger = logging.getLogger(__name__)
+
+# Marks a value stored as an image file next to the stage's JSON
+IMAGE_MARKER = "__image__"
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write a file so a crash never leaves it half written."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class CheckpointStore:
+    """
+    Local, per-analysis store of completed stage outputs, so a retry after a crash resumes from the
+    last completed stage. Each analysis gets a directory with one JSON file per stage; EncodedImage
+    values are stored as image files beside it.
+    """
+
+    def __init__(self, directory: str = config.CHECKPOINT_DIR, ttl: int = config.CHECKPOINT_TTL):
+        # Created by the first save, so importing the service writes nothing to disk
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key
+
+    def save(self, key: str, stage: str, value: Dict[str, Any]) -> None:
+        """Record the output of a completed stage."""
+        path = self._path(key)
+        try:
+            path.mkdir(parents=True, exist_ok=True)
+            stored = {}
+            for name, item in value.items():
+                if isinstance(item, EncodedImage):
+                    filename = f"{stage}.{name}.{item.extension}"
+                    write_atomic(path / filename, item.data)
+                    item = {IMAGE_MARKER: filename, "format": item.format, "width": item.width, "height": item.height}
+                stored[name] = item
+            # The JSON is written last, so a stage only counts as done once all its files exist
+            write_atomic(path / f"{stage}.json", json.dumps(stored).encode("utf-8"))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not checkpoint stage {stage} of {key[:12]}: {str(e)}")
+
+    def load(self, key: str, stage: str) -> Optional[Dict[str, Any]]:
+        """Return the output of a stage completed by an earlier attempt, or None."""
+        path = self._path(key) / f"{stage}.json"
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            stored = json.loads(path.read_text())
+            value = {}
+            for name, item in stored.items():
+                if isinstance(item, dict) and IMAGE_MARKER in item:
+                    data = (path.parent / item[IMAGE_MARKER]).read_bytes()
+                    item = EncodedImage(data, item["format"], item["width"], item["height"])
+                value[name] = item
+        except (OSError, ValueError):
+            return None
+        logger.info(f"Resuming {key[:12]} from checkpointed stage {stage}")
+        return value
+
+    def clear(self, key: str) -> None:
+        """Drop the checkpoints of an analysis once it has completed."""
+        shutil.rmtree(self._path(key), ignore_errors=True)
+
+    def prune(self) -> int:
+        """Remove checkpoints older than the TTL and return how many analyses were removed."""
+        removed = 0
+        cutoff = time.time() - self.ttl
+        if not self.directory.is_dir():
+            return removed
+        for path in self.directory.iterdir():
+            try:
+                if path.is_dir() and path.stat().st_mtime < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+def create_checkpoint_store() -> Optional[CheckpointStore]:
+    if not config.CHECKPOINTS_ENABLED:
+        return None
+    return CheckpointStore()
+
+
+checkpoint_store = create_checkpoint_store()
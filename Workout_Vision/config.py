@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -7,6 +8,8 @@ load_dotenv()
 
 # Base paths
 BASE_DIR = Path(__file__).resolve().parent
+# Caches and other local state, outside the source tree; created on first use
+DATA_DIR = os.getenv("DATA_DIR") or os.path.join(tempfile.gettempdir(), "workout_vision")
 
 # API Configuration
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
@@ -18,6 +21,8 @@ OPENAI_VISION_MODEL = os.getenv("OPENAI_VISION_MODEL", "gpt-4o-mini")
 OPENAI_VISION_MAX_TOKENS = int(os.getenv("OPENAI_VISION_MAX_TOKENS", "500"))
 OPENAI_TTS_MODEL = os.getenv("OPENAI_TTS_MODEL", "tts-1")
 OPENAI_TTS_VOICE = os.getenv("OPENAI_TTS_VOICE", "alloy")
+# Bump when the vision prompt changes so cached analyses are not reused
+VISION_PROMPT_VERSION = os.getenv("VISION_PROMPT_VERSION", "1")
 
 # Supabase Configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -29,10 +34,75 @@ ALLOWED_VIDEO_DOMAINS = os.getenv("ALLOWED_VIDEO_DOMAINS", "supabase.co").split(
 DEFAULT_FRAME_SKIP = int(os.getenv("DEFAULT_FRAME_SKIP", "10"))
 MAX_FRAME_SKIP = int(os.getenv("MAX_FRAME_SKIP", "30"))
 MIN_FRAME_SKIP = int(os.getenv("MIN_FRAME_SKIP", "1"))
+DEFAULT_SAMPLING_MODE = os.getenv("DEFAULT_SAMPLING_MODE", "grab")
+MAX_SAMPLES_PER_SECOND = float(os.getenv("MAX_SAMPLES_PER_SECOND", "30"))
+DEFAULT_BATCH_SIZE = int(os.getenv("DEFAULT_BATCH_SIZE", "1"))
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "16"))
+DEFAULT_SEARCH_MODE = os.getenv("DEFAULT_SEARCH_MODE", "fixed")
+ADAPTIVE_FINE_STEP = int(os.getenv("ADAPTIVE_FINE_STEP", "1"))
+ADAPTIVE_MAX_MINIMA = int(os.getenv("ADAPTIVE_MAX_MINIMA", "3"))
+STREAM_PROGRESS_INTERVAL = int(os.getenv("STREAM_PROGRESS_INTERVAL", "5"))
+DEFAULT_SEGMENTS = int(os.getenv("DEFAULT_SEGMENTS", "1"))
+MAX_SEGMENTS = int(os.getenv("MAX_SEGMENTS", "8"))
+SEGMENT_WARMUP_SAMPLES = int(os.getenv("SEGMENT_WARMUP_SAMPLES", "3"))
 DANGER_ANGLE_THRESHOLD = float(os.getenv("DANGER_ANGLE_THRESHOLD", "60"))
-POSE_MODEL =  "yolo11m-pose.pt"
+DEFAULT_SNAPSHOTS = int(os.getenv("DEFAULT_SNAPSHOTS", "1"))
+MAX_SNAPSHOTS = int(os.getenv("MAX_SNAPSHOTS", "4"))
+SNAPSHOT_MAX_DIM = int(os.getenv("SNAPSHOT_MAX_DIM", "512"))
+SNAPSHOT_MIN_SEPARATION_SECONDS = float(os.getenv("SNAPSHOT_MIN_SEPARATION_SECONDS", "1.0"))
+REP_UP_ANGLE = float(os.getenv("REP_UP_ANGLE", "150"))
+REP_DOWN_ANGLE = float(os.getenv("REP_DOWN_ANGLE", "120"))
+# Time constant of the knee-angle smoothing; the per-sample alpha is only used when the frame rate is unknown
+REP_SMOOTHING_SECONDS = float(os.getenv("REP_SMOOTHING_SECONDS", "0.15"))
+REP_SMOOTHING_ALPHA = float(os.getenv("REP_SMOOTHING_ALPHA", "0.5"))
+POSE_MODEL = os.getenv("POSE_MODEL", "yolo11m-pose.pt")
+# name=model pairs, most accurate first; models are .pt weights, .onnx files or *_openvino_model directories
+POSE_BACKENDS = os.getenv("POSE_BACKENDS", "medium=yolo11m-pose.pt,small=yolo11s-pose.pt,nano=yolo11n-pose.pt")
+# Empty uses the backend of POSE_MODEL; "auto" picks a backend per video from its size and the load
+DEFAULT_POSE_BACKEND = os.getenv("DEFAULT_POSE_BACKEND", "")
+POSE_AUTO_HIGH_RES = int(os.getenv("POSE_AUTO_HIGH_RES", "1920"))
+POSE_AUTO_LONG_SAMPLES = int(os.getenv("POSE_AUTO_LONG_SAMPLES", "300"))
+POSE_AUTO_BUSY_JOBS = int(os.getenv("POSE_AUTO_BUSY_JOBS", "4"))
 POSE_KEYPOINTS = [int(k) for k in os.getenv("POSE_KEYPOINTS", "12,14,16").split(",")]
 POSE_LINE_WIDTH = int(os.getenv("POSE_LINE_WIDTH", "4"))
+POSE_JOINTS = [j.strip() for j in os.getenv("POSE_JOINTS", "left_knee,right_knee,left_hip,right_hip,left_elbow,right_elbow").split(",") if j.strip()]
+
+# Pipeline Configuration (0 runs decode, inference and post-processing serially)
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+
+# Model Pool Configuration
+POSE_MODEL_POOL_SIZE = int(os.getenv("POSE_MODEL_POOL_SIZE", "1"))
+POSE_MODEL_POOL_TIMEOUT = float(os.getenv("POSE_MODEL_POOL_TIMEOUT", "60"))
+
+# Inference Process Pool Configuration (0 workers runs inference in the API process)
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0"))
+INFERENCE_THREADS_PER_WORKER = int(os.getenv("INFERENCE_THREADS_PER_WORKER", "0"))  # 0 splits the cores evenly
+INFERENCE_SLOTS_PER_WORKER = int(os.getenv("INFERENCE_SLOTS_PER_WORKER", "2"))
+INFERENCE_SLOT_BYTES = int(os.getenv("INFERENCE_SLOT_BYTES", str(1920 * 1080 * 3)))
+INFERENCE_START_METHOD = os.getenv("INFERENCE_START_METHOD", "fork")
+
+# Startup Configuration
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+WARMUP_FRAME_WIDTH = int(os.getenv("WARMUP_FRAME_WIDTH", "1280"))
+WARMUP_FRAME_HEIGHT = int(os.getenv("WARMUP_FRAME_HEIGHT", "720"))
+
+# Checkpoint Configuration
+# Completed stage outputs of each analysis, so a retry after a crash resumes; empty to disable
+CHECKPOINTS_ENABLED = os.getenv("CHECKPOINTS_ENABLED", "true").lower() == "true"
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR") or os.path.join(DATA_DIR, "checkpoints")
+CHECKPOINT_TTL = int(os.getenv("CHECKPOINT_TTL", "3600"))
+
+# Batch Analysis Configuration
+BATCH_MAX_VIDEOS = int(os.getenv("BATCH_MAX_VIDEOS", "20"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "0"))
+BATCH_VISION_MAX_IMAGES = int(os.getenv("BATCH_VISION_MAX_IMAGES", "4"))
+
+# Job Queue Configuration
+# Capped at the model pool size: a job beyond it would wait in the model checkout, where it can time out with 503
+JOB_CONCURRENCY = min(int(os.getenv("JOB_CONCURRENCY", "0")) or POSE_MODEL_POOL_SIZE, POSE_MODEL_POOL_SIZE)
+JOB_QUEUE_DEPTH = int(os.getenv("JOB_QUEUE_DEPTH", "16"))
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "3600"))
+JOB_RETRY_AFTER = int(os.getenv("JOB_RETRY_AFTER", "5"))
 
 # Circle indicator configuration
 CIRCLE_OFFSET_X = int(os.getenv("CIRCLE_OFFSET_X", "-20"))
@@ -41,6 +111,12 @@ CIRCLE_THICKNESS = int(os.getenv("CIRCLE_THICKNESS", "3"))
 DANGER_COLOR = tuple(map(int, os.getenv("DANGER_COLOR", "0,0,255").split(",")))  # Red
 NORMAL_COLOR = tuple(map(int, os.getenv("NORMAL_COLOR", "104,31,17").split(",")))  # Custom normal color
 
+# Image Output Configuration
+IMAGE_FORMAT = os.getenv("IMAGE_FORMAT", "jpeg")  # png, jpeg or webp
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "90"))
+VISION_IMAGE_MAX_DIM = int(os.getenv("VISION_IMAGE_MAX_DIM", "1024"))
+THUMBNAIL_MAX_DIM = int(os.getenv("THUMBNAIL_MAX_DIM", "320"))
+
 # Cleanup Configuration
 CLEANUP_HOURS = int(os.getenv("CLEANUP_HOURS", "24"))
 
@@ -50,4 +126,25 @@ LOG_FORMAT = os.getenv("LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %
 
 # HTTP Request Configuration
 HTTP_TIMEOUT = int(os.getenv("HTTP_TIMEOUT", "30"))
-HTTP_CHUNK_SIZE = int(os.getenv("HTTP_CHUNK_SIZE", "8192")) 
\ No newline at end of file
+HTTP_CHUNK_SIZE = int(os.getenv("HTTP_CHUNK_SIZE", "8192"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.5"))
+HTTP_RETRY_MAX_BACKOFF = float(os.getenv("HTTP_RETRY_MAX_BACKOFF", "8"))
+
+# Result Cache Configuration
+RESULT_CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "memory")  # memory, sqlite or none
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH") or os.path.join(DATA_DIR, "cache.sqlite3")
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "86400"))
+# Vision analyses and TTS audio URLs keyed by their inputs; memory, sqlite (stored in RESULT_CACHE_PATH) or none
+OPENAI_CACHE_BACKEND = os.getenv("OPENAI_CACHE_BACKEND", "sqlite")
+OPENAI_CACHE_MAX_ENTRIES = int(os.getenv("OPENAI_CACHE_MAX_ENTRIES", "1024"))
+# At most the storage retention, since TTS hits return the URL of an already uploaded file
+OPENAI_CACHE_TTL = int(os.getenv("OPENAI_CACHE_TTL", str(CLEANUP_HOURS * 3600)))
+
+# Video Ingestion Configuration
+MAX_VIDEO_BYTES = int(os.getenv("MAX_VIDEO_BYTES", str(500 * 1024 * 1024)))
+VIDEO_TEMP_DIR = os.getenv("VIDEO_TEMP_DIR") or None 
\ No newline at end of file
@@ -0,0 +1,116 @@
+import logging
+import time
+from typing import TYPE_CHECKING, Iterator, Optional, Tuple
+
+import numpy as np
+
+import config
+from metrics import FRAME_DECODE_SECONDS, FRAMES_DECODED
+
+if TYPE_CHECKING:
+    import cv2
+
+logger = logging.getLogger(__name__)
+
+SAMPLING_MODES = ("read", "grab", "seek")
+
+
+def resolve_frame_step(cap: "cv2.VideoCapture", frame_skip: int, samples_per_second: Optional[float] = None) -> int:
+    """Return the frame stride, derived from the video FPS when time-based sampling is requested."""
+    if samples_per_second:
+        import cv2
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if fps and fps > 0:
+            return max(1, int(round(fps / samples_per_second)))
+        logger.warning("Video FPS unavailable, falling back to frame_skip")
+    return max(1, frame_skip)
+
+
+def sample_frames(
+    cap: "cv2.VideoCapture",
+    step: int,
+    mode: str = config.DEFAULT_SAMPLING_MODE,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yield (frame_index, frame) for every `step`th frame of the capture.
+
+    - read: decode every frame and drop the ones that are not sampled (original behaviour)
+    - grab: demux skipped frames with grab() and only decode sampled ones with retrieve()
+    - seek: jump straight to each sampled frame with CAP_PROP_POS_FRAMES (best for large strides)
+    """
+    if mode not in SAMPLING_MODES:
+        raise ValueError(f"Invalid sampling mode '{mode}'. Must be one of: {', '.join(SAMPLING_MODES)}")
+
+    if mode == "seek":
+        import cv2
+
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        # Some streams do not report a frame count, so seeking blind is not possible
+        if total_frames > 0:
+            for frame_index in range(0, total_frames, step):
+                start = time.perf_counter()
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+                success, frame = cap.read()
+                if not success:
+                    break
+                FRAME_DECODE_SECONDS.observe(time.perf_counter() - start)
+                FRAMES_DECODED.inc()
+                yield frame_index, frame
+            return
+        logger.warning("Frame count unavailable, falling back to grab sampling")
+        mode = "grab"
+
+    frame_index = 0
+    # Decode time of a sampled frame includes reading or grabbing the frames skipped before it
+    start = time.perf_counter()
+    while cap.isOpened():
+        if mode == "read":
+            success, frame = cap.read()
+            if not success:
+                break
+            FRAMES_DECODED.inc()
+            if frame_index % step == 0:
+                FRAME_DECODE_SECONDS.observe(time.perf_counter() - start)
+                yield frame_index, frame
+                start = time.perf_counter()
+        else:
+            if not cap.grab():
+                break
+            if frame_index % step == 0:
+                success, frame = cap.retrieve()
+                if not success:
+                    break
+                FRAME_DECODE_SECONDS.observe(time.perf_counter() - start)
+                FRAMES_DECODED.inc()
+                yield frame_index, frame
+                start = time.perf_counter()
+        frame_index += 1
+
+
+def read_frame_range(cap: "cv2.VideoCapture", start: int, stop: int, step: int = 1) -> Iterator[Tuple[int, np.ndarray]]:
+    """Seek to `start` and yield (frame_index, frame) for every `step`th frame before `stop`."""
+    import cv2
+
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    decode_start = time.perf_counter()
+    for frame_index in range(start, stop):
+        if not cap.grab():
+            break
+        if (frame_index - start) % step == 0:
+            success, frame = cap.retrieve()
+            if not success:
+                break
+            FRAME_DECODE_SECONDS.observe(time.perf_counter() - decode_start)
+            FRAMES_DECODED.inc()
+            yield frame_index, frame
+            decode_start = time.perf_counter()
+
+
+def read_frame_at(cap: "cv2.VideoCapture", frame_index: int) -> Optional[np.ndarray]:
+    """Seek to and decode a single frame, or return None if it cannot be read."""
+    import cv2
+
+    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+    success, frame = cap.read()
+    return frame if success else None
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def backoff_delays(
+    retries: int = config.HTTP_RETRIES,
+    base: float = config.HTTP_RETRY_BACKOFF,
+    cap: float = config.HTTP_RETRY_MAX_BACKOFF,
+) -> Iterator[float]:
+    """Exponential backoff with full jitter: each delay is uniform in [0, min(cap, base * 2^attempt)]."""
+    for attempt in range(retries):
+        yield random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (httpx.TransportError, requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRY_STATUS_CODES
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRY_STATUS_CODES
+    return False
+
+
+async def with_retries(call: Callable[[], Awaitable[T]], retries: int = config.HTTP_RETRIES) -> T:
+    """Await `call`, retrying transport errors and retryable status codes with jittered backoff."""
+    for delay in backoff_delays(retries):
+        try:
+            return await call()
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            logger.warning(f"Retrying in {delay:.2f}s after: {str(e)}")
+            await asyncio.sleep(delay)
+    return await call()
+
+
+def with_retries_sync(call: Callable[[], T], retries: int = config.HTTP_RETRIES) -> T:
+    """Blocking counterpart of with_retries for code running on worker threads."""
+    for delay in backoff_delays(retries):
+        try:
+            return call()
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            logger.warning(f"Retrying in {delay:.2f}s after: {str(e)}")
+            time.sleep(delay)
+    return call()
+
+
+def create_async_client(**kwargs) -> httpx.AsyncClient:
+    """Create an httpx.AsyncClient with the configured keep-alive connection pool."""
+    return httpx.AsyncClient(
+        timeout=config.HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        **kwargs,
+    )
+
+
+def create_session() -> requests.Session:
+    """Create a requests.Session whose connection pool is sized like the async client's."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=config.HTTP_MAX_KEEPALIVE, pool_maxsize=config.HTTP_MAX_CONNECTIONS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class HTTPClients:
+    """
+    Process-wide keep-alive HTTP clients: an httpx.AsyncClient for the event loop
+    and a requests.Session for blocking work on the analysis threads (video download, HEAD).
+    Both are created on first use and closed from the application lifespan.
+    """
+
+    def __init__(self):
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._session: Optional[requests.Session] = None
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = create_async_client()
+        return self._async_client
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            self._session = create_session()
+        return self._session
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+http_clients = HTTPClients()
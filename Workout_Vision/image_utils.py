@@ -0,0 +1,89 @@
+import base64
+from typing import Optional, Sequence
+
+import numpy as np
+
+import config
+from metrics import IMAGE_ENCODE_SECONDS
+
+# format -> (file extension, content type, name of the OpenCV quality flag)
+IMAGE_FORMATS = {
+    "png": ("png", "image/png", None),
+    "jpeg": ("jpg", "image/jpeg", "IMWRITE_JPEG_QUALITY"),
+    "webp": ("webp", "image/webp", "IMWRITE_WEBP_QUALITY"),
+}
+
+
+class EncodedImage:
+    """An image encoded once, whose bytes and base64 are shared by the upload and the vision payload."""
+
+    def __init__(self, data: bytes, image_format: str, width: int, height: int):
+        self.data = data
+        self.format = image_format
+        self.extension, self.content_type, _ = IMAGE_FORMATS[image_format]
+        self.width = width
+        self.height = height
+        self._base64: Optional[str] = None
+
+    @property
+    def base64(self) -> str:
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self.data).decode("utf-8")
+        return self._base64
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.content_type};base64,{self.base64}"
+
+
+def encode_image(
+    frame: np.ndarray,
+    image_format: str = config.IMAGE_FORMAT,
+    quality: int = config.IMAGE_QUALITY,
+    max_dim: Optional[int] = None,
+) -> EncodedImage:
+    """Optionally downscale a frame, then encode it as PNG, JPEG or WebP."""
+    import cv2
+
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Invalid image format '{image_format}'. Must be one of: {', '.join(IMAGE_FORMATS)}")
+    if max_dim:
+        frame = downscale_frame(frame, max_dim)
+
+    extension, _, quality_flag = IMAGE_FORMATS[image_format]
+    params = [getattr(cv2, quality_flag), quality] if quality_flag is not None else []
+    with IMAGE_ENCODE_SECONDS.time(format=image_format):
+        success, buffer = cv2.imencode(f".{extension}", frame, params)
+    if not success:
+        raise ValueError(f"Could not encode image as {image_format}")
+    # The only copy: out of OpenCV's buffer into the bytes shared by every consumer
+    return EncodedImage(buffer.tobytes(), image_format, frame.shape[1], frame.shape[0])
+
+
+def downscale_frame(frame: np.ndarray, max_dim: int) -> np.ndarray:
+    """Resize a frame so its longest side is at most max_dim, keeping the aspect ratio."""
+    import cv2
+
+    height, width = frame.shape[:2]
+    scale = max_dim / max(height, width)
+    if scale >= 1:
+        return frame
+    return cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+
+def tile_frames(frames: Sequence[np.ndarray], labels: Sequence[str], columns: int = 2) -> np.ndarray:
+    """Tile frames into a labelled grid image, padding each cell to the largest frame."""
+    import cv2
+
+    cell_h = max(frame.shape[0] for frame in frames)
+    cell_w = max(frame.shape[1] for frame in frames)
+    columns = min(columns, len(frames))
+    rows = (len(frames) + columns - 1) // columns
+    grid = np.zeros((rows * cell_h, columns * cell_w, 3), dtype=np.uint8)
+
+    for i, (frame, label) in enumerate(zip(frames, labels)):
+        y, x = (i // columns) * cell_h, (i % columns) * cell_w
+        grid[y:y + frame.shape[0], x:x + frame.shape[1]] = frame
+        cv2.putText(grid, label, (x + 10, y + 30), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 0), 4, cv2.LINE_AA)
+        cv2.putText(grid, label, (x + 10, y + 30), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2, cv2.LINE_AA)
+    return grid
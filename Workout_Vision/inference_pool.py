@@ -0,0 +1,260 @@
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Weights loaded in the parent before forking, so every forked worker shares the same pages copy-on-write
+_preloaded_model = None
+
+
+def _load_model(model_path: str):
+    from ultralytics import YOLO
+
+    return YOLO(model_path)
+
+
+def _worker_main(
+    worker_id: int,
+    conn,
+    slot_names: List[str],
+    model_path: str,
+    threads: int,
+) -> None:
+    """Inference worker: read frames from shared memory slots and send back keypoints."""
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    import torch
+
+    torch.set_num_threads(threads)
+    model = _preloaded_model if _preloaded_model is not None else _load_model(model_path)
+    slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            request_id, slot_id, shape, dtype, predict_args = message
+            try:
+                # A view onto the shared slot, the frame is not copied into the worker
+                frame = np.ndarray(shape, dtype=dtype, buffer=slots[slot_id].buf)
+                # The AIGym arguments may carry their own verbose flag, so it is overridden rather than passed twice
+                result = model.predict(source=frame, **{**predict_args, "verbose": False})[0]
+                keypoints = result.keypoints.data.cpu().numpy()[::-1].copy() if len(result) else None
+                conn.send((request_id, keypoints, None))
+            except Exception as e:
+                conn.send((request_id, None, f"{type(e).__name__}: {e}"))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        for slot in slots:
+            slot.close()
+        conn.close()
+
+
+class _Worker:
+    def __init__(self, worker_id: int, process, conn, slots: List[shared_memory.SharedMemory]):
+        self.worker_id = worker_id
+        self.process = process
+        self.conn = conn
+        self.slots = slots
+        self.send_lock = threading.Lock()
+        self.reader: Optional[threading.Thread] = None
+
+
+class InferencePool:
+    """
+    Pool of pose inference processes fed through shared memory.
+
+    Each worker owns `slots_per_worker` shared memory buffers. A frame is copied once into a free
+    slot and the worker reads it in place; only the (people, 17, 3) keypoint array comes back.
+    Workers predict without a tracker, like the batched path, so per-video tracking state stays out of them.
+    """
+
+    def __init__(
+        self,
+        workers: int = config.INFERENCE_WORKERS,
+        threads_per_worker: int = config.INFERENCE_THREADS_PER_WORKER,
+        slots_per_worker: int = config.INFERENCE_SLOTS_PER_WORKER,
+        slot_bytes: int = config.INFERENCE_SLOT_BYTES,
+        start_method: str = config.INFERENCE_START_METHOD,
+        model_path: str = config.POSE_MODEL,
+        timeout: float = config.POSE_MODEL_POOL_TIMEOUT,
+    ):
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // max(1, workers))
+        self.slots_per_worker = slots_per_worker
+        self.slot_bytes = slot_bytes
+        self.start_method = start_method
+        self.model_path = model_path
+        self.timeout = timeout
+        self._workers: List[_Worker] = []
+        self._free_slots: "queue.Queue[Tuple[int, int]]" = queue.Queue()
+        self._futures: Dict[int, Tuple[Future, Tuple[int, int]]] = {}
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._next_id = 0
+        self._frames = 0
+        self.started = False
+        self.load_seconds = 0.0
+
+    @property
+    def capacity(self) -> int:
+        """Number of frames that can be in flight at once."""
+        return self.workers * self.slots_per_worker
+
+    def serves(self, model_path: Optional[str]) -> bool:
+        """Whether frames of the given model can be predicted here; the workers run only `model_path`."""
+        return self.started and model_path == self.model_path
+
+    @property
+    def ready(self) -> bool:
+        """Whether the pool is running, or is disabled and has nothing to start."""
+        return self.started or self.workers <= 0
+
+    def fits(self, frame: np.ndarray) -> bool:
+        """Whether a frame fits in a shared memory slot."""
+        return frame.nbytes <= self.slot_bytes
+
+    def start(self) -> None:
+        """
+        Start the worker processes. Call before the parent runs any inference:
+        with the fork start method the weights are loaded here and inherited by every worker.
+        Safe to call from several threads; only the first starts the workers.
+        """
+        with self._start_lock:
+            self._start()
+
+    def _start(self) -> None:
+        global _preloaded_model
+        if self.started or self.workers <= 0:
+            return
+        start = time.perf_counter()
+        ctx = mp.get_context(self.start_method)
+        if self.start_method == "fork":
+            _preloaded_model = _load_model(self.model_path)
+
+        for worker_id in range(self.workers):
+            slots = [shared_memory.SharedMemory(create=True, size=self.slot_bytes) for _ in range(self.slots_per_worker)]
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker_main,
+                args=(worker_id, child_conn, [slot.name for slot in slots], self.model_path, self.threads_per_worker),
+                name=f"pose-inference-{worker_id}",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+
+            worker = _Worker(worker_id, process, parent_conn, slots)
+            worker.reader = threading.Thread(target=self._read_results, args=(worker,), daemon=True)
+            worker.reader.start()
+            self._workers.append(worker)
+            for slot_id in range(self.slots_per_worker):
+                self._free_slots.put((worker_id, slot_id))
+
+        # The parent only needed the weights to hand them to the forked workers
+        _preloaded_model = None
+        self.load_seconds = time.perf_counter() - start
+        self.started = True
+        logger.info(
+            f"Inference pool started with {self.workers} worker(s) x {self.threads_per_worker} thread(s) "
+            f"using {self.start_method} in {self.load_seconds:.2f}s"
+        )
+
+    def close(self) -> None:
+        """Stop the workers and release the shared memory."""
+        for worker in self._workers:
+            try:
+                with worker.send_lock:
+                    worker.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self._workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
+            for slot in worker.slots:
+                slot.close()
+                slot.unlink()
+        self._workers = []
+        self._free_slots = queue.Queue()
+        self.started = False
+
+    def _read_results(self, worker: _Worker) -> None:
+        while True:
+            try:
+                request_id, keypoints, error = worker.conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                future, slot = self._futures.pop(request_id)
+            self._free_slots.put(slot)
+            if error is not None:
+                future.set_exception(RuntimeError(f"Pose inference failed in worker {worker.worker_id}: {error}"))
+            else:
+                future.set_result(keypoints)
+
+        # The worker is gone, fail whatever it still had in flight
+        with self._lock:
+            lost = [request_id for request_id, (_, slot) in self._futures.items() if slot[0] == worker.worker_id]
+            for request_id in lost:
+                future, _ = self._futures.pop(request_id)
+                future.set_exception(RuntimeError(f"Inference worker {worker.worker_id} exited"))
+        if self.started:
+            logger.error(f"Inference worker {worker.worker_id} exited unexpectedly")
+
+    def submit(self, frame: np.ndarray, predict_args: Optional[Dict[str, Any]] = None) -> Future:
+        """Copy a frame into a free shared memory slot and return a future for its keypoints (or None)."""
+        if not self.started:
+            self.start()
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {frame.nbytes} bytes exceeds INFERENCE_SLOT_BYTES ({self.slot_bytes})")
+
+        try:
+            worker_id, slot_id = self._free_slots.get(timeout=self.timeout)
+        except queue.Empty:
+            raise HTTPException(status_code=503, detail="No inference worker available, please retry later")
+        worker = self._workers[worker_id]
+        np.ndarray(frame.shape, dtype=frame.dtype, buffer=worker.slots[slot_id].buf)[...] = frame
+
+        future: Future = Future()
+        with self._lock:
+            request_id = self._next_id
+            self._next_id += 1
+            self._frames += 1
+            self._futures[request_id] = (future, (worker_id, slot_id))
+        with worker.send_lock:
+            worker.conn.send((request_id, slot_id, frame.shape, frame.dtype.str, predict_args or {}))
+        return future
+
+    def infer(self, frame: np.ndarray, predict_args: Optional[Dict[str, Any]] = None) -> Optional[np.ndarray]:
+        """Run one frame through a worker and wait for its keypoints."""
+        return self.submit(frame, predict_args).result(timeout=self.timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return worker count, slot usage and frames processed."""
+        return {
+            "workers": self.workers,
+            "threads_per_worker": self.threads_per_worker,
+            "alive": sum(1 for worker in self._workers if worker.process.is_alive()),
+            "slots": self.capacity,
+            "slots_in_use": self.capacity - self._free_slots.qsize() if self.started else 0,
+            "frames": self._frames,
+            "load_seconds": round(self.load_seconds, 6),
+        }
+
+
+inference_pool = InferencePool()
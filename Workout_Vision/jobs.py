@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Bounded executor for blocking work (OpenCV decoding, pose inference, sync API clients)
+analysis_executor = ThreadPoolExecutor(
+    max_workers=config.JOB_CONCURRENCY,
+    thread_name_prefix="analysis",
+)
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking function on the analysis executor without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(analysis_executor, func, *args)
+
+
+@dataclass
+class Job:
+    job_id: str
+    status: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """In-memory job registry with a concurrency limit and a bounded queue."""
+
+    def __init__(
+        self,
+        concurrency: int = config.JOB_CONCURRENCY,
+        queue_depth: int = config.JOB_QUEUE_DEPTH,
+        result_ttl: int = config.JOB_RESULT_TTL,
+    ):
+        self.concurrency = concurrency
+        self.queue_depth = queue_depth
+        self.result_ttl = result_ttl
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs that are queued or running."""
+        return self._pending
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == "queued")
+
+    def submit(self, work: Callable[[], Awaitable[Dict[str, Any]]]) -> Job:
+        """Register a job and schedule it, or raise 429 when the queue is full."""
+        self._expire()
+        if self._pending >= self.concurrency + self.queue_depth:
+            raise HTTPException(
+                status_code=429,
+                detail="Analysis queue is full, please retry later",
+                headers={"Retry-After": str(config.JOB_RETRY_AFTER)},
+            )
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        job = Job(job_id=os.urandom(8).hex())
+        self._jobs[job.job_id] = job
+        self._pending += 1
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job, work))
+        logger.info(f"Queued job {job.job_id} ({self._pending} pending)")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._expire()
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: Job, work: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        try:
+            async with self._semaphore:
+                job.status = "running"
+                job.started_at = time.time()
+                logger.info(f"Running job {job.job_id}")
+                job.result = await work()
+                job.status = "completed"
+        except HTTPException as e:
+            job.status = "failed"
+            job.error = str(e.detail)
+        except Exception as e:
+            logger.error(f"Error in job {job.job_id}: {str(e)}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            self._pending -= 1
+            self._tasks.pop(job.job_id, None)
+            logger.info(f"Job {job.job_id} {job.status}")
+
+    def _expire(self) -> None:
+        """Drop finished jobs older than the result TTL."""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+job_manager = JobManager()
@@ -0,0 +1,57 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+import config
+
+# COCO keypoint triplets (a, vertex, c) for the joints we can measure
+JOINT_TRIPLETS: Dict[str, Tuple[int, int, int]] = {
+    "left_knee": (11, 13, 15),
+    "right_knee": (12, 14, 16),
+    "left_hip": (5, 11, 13),
+    "right_hip": (6, 12, 14),
+    "left_elbow": (5, 7, 9),
+    "right_elbow": (6, 8, 10),
+}
+
+
+def joint_triplets(joints: Sequence[str] = config.POSE_JOINTS) -> np.ndarray:
+    """Return a (J, 3) array of keypoint indices for the given joint names."""
+    unknown = [joint for joint in joints if joint not in JOINT_TRIPLETS]
+    if unknown:
+        raise ValueError(f"Unknown joints: {', '.join(unknown)}. Must be among: {', '.join(JOINT_TRIPLETS)}")
+    return np.array([JOINT_TRIPLETS[joint] for joint in joints], dtype=np.intp).reshape(-1, 3)
+
+
+def compute_joint_angles(keypoints: np.ndarray, triplets: np.ndarray) -> np.ndarray:
+    """
+    Compute joint angles in degrees for every person and every triplet in one array operation.
+
+    keypoints: (P, K, 2+) array of keypoint coordinates for P people
+    triplets: (J, 3) array of keypoint indices
+    Returns a (P, J) array, using the same formula as Annotator.estimate_pose_angle.
+    """
+    if keypoints.shape[0] == 0:
+        return np.empty((0, len(triplets)), dtype=np.float32)
+
+    a = keypoints[:, triplets[:, 0], :2]
+    b = keypoints[:, triplets[:, 1], :2]
+    c = keypoints[:, triplets[:, 2], :2]
+    radians = np.arctan2(c[..., 1] - b[..., 1], c[..., 0] - b[..., 0]) - np.arctan2(a[..., 1] - b[..., 1], a[..., 0] - b[..., 0])
+    angles = np.abs(np.degrees(radians))
+    return np.where(angles > 180.0, 360.0 - angles, angles)
+
+
+class JointAngleEngine:
+    """Joint triplets resolved once, with the primary (knee) triplet from POSE_KEYPOINTS first."""
+
+    def __init__(self, primary: Sequence[int] = config.POSE_KEYPOINTS, joints: Sequence[str] = config.POSE_JOINTS):
+        self.joints: List[str] = ["primary"] + list(joints)
+        self.triplets = np.vstack([np.array([primary[:3]], dtype=np.intp), joint_triplets(joints)])
+
+    def compute(self, keypoints: np.ndarray) -> np.ndarray:
+        """Return a (P, 1 + J) angle matrix whose first column is the primary knee angle."""
+        return compute_joint_angles(keypoints, self.triplets)
+
+
+joint_angle_engine = JointAngleEngine()
@@ -1,33 +1,57 @@
-import cv2
-import numpy as np
+# Imported first so the startup timings cover every other import
+from startup import startup_state, prepare
+
 import requests
-import base64
-import tempfile
 import os
-import io
 import re
 import logging
 import time
-import shutil
 import json
-from typing import Optional, Dict, Any, Tuple, Callable
-from pathlib import Path
+import asyncio
+from functools import partial
+from contextlib import asynccontextmanager, closing, ExitStack
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple, Callable
 
 from fastapi import FastAPI, HTTPException, Query, Response, Request, Depends, status
-from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, RedirectResponse
+from fastapi.responses import JSONResponse, StreamingResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from pydantic import BaseModel, Field
 
-from ultralytics import solutions
-from ultralytics.utils.plotting import Annotator
-
-import openai
 from dotenv import load_dotenv
-from supabase import create_client, Client
 
 # Import configuration from config.py
 import config
+from model_pool import ModelPool, model_pool
+from http_clients import http_clients, create_async_client
+from storage import storage
+from pose_backends import AUTO_BACKEND, DEFAULT_BACKEND, pose_backends
+from inference_pool import inference_pool
+from jobs import job_manager, analysis_executor, run_blocking
+from frame_sampling import SAMPLING_MODES, resolve_frame_step, sample_frames, read_frame_at
+from pose_analysis import monitor_frames, annotate_frame
+from pose_track import PoseTrack
+from joint_angles import joint_angle_engine
+from rep_analysis import RepSegmenter
+from image_utils import downscale_frame, tile_frames, encode_image
+from adaptive_search import SEARCH_MODES, adaptive_search
+from video_ingest import open_video_source
+from segments import segmented_frames
+from pipeline import prefetch
+from batching import RequestBatcher
+from singleflight import SingleFlight
+from checkpoints import checkpoint_store
+from cache import (
+    hash_key, result_cache, result_cache_key, fetch_video_validator,
+    vision_cache, vision_cache_key, tts_cache, tts_cache_key, open_caches
+)
+from timings import StageTimings
+from metrics import (
+    registry, Gauge, OPENAI_CACHE_LOOKUPS, VISION_SECONDS, TTS_SECONDS, REQUEST_SECONDS
+)
+
+if TYPE_CHECKING:
+    import openai
 
 # ================ CONFIGURATION ================
 
@@ -41,26 +65,74 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-# Check for required environment variables
-if not config.OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY environment variable is not set")
+def check_required_settings() -> None:
+    """
+    Fail startup when credentials are missing. Called from the lifespan rather than at import,
+    so the processing functions can be imported and benchmarked with fake clients.
+    """
+    # Check for required environment variables
+    if not config.OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY environment variable is not set")
 
-# Check for Supabase credentials
-if not config.SUPABASE_URL or not config.SUPABASE_KEY:
-    raise ValueError("SUPABASE_URL and SUPABASE_KEY environment variables are required")
+    # Check for Supabase credentials
+    if not config.SUPABASE_URL or not config.SUPABASE_KEY:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY environment variables are required")
 
-# Initialize Supabase client
-supabase: Client = create_client(config.SUPABASE_URL, config.SUPABASE_KEY)
-logger.info(f"Initialized Supabase client for URL: {config.SUPABASE_URL}")
+    logger.info(f"Using Supabase storage at URL: {config.SUPABASE_URL}")
 
-# Initialize OpenAI client once
-openai_client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
+# OpenAI client, created once on first use; async so vision, TTS and uploads can overlap, on its own keep-alive pool
+openai_client: Optional["openai.AsyncOpenAI"] = None
+
+def get_openai_client() -> "openai.AsyncOpenAI":
+    """Return the shared OpenAI client, creating it on first use so importing the service stays fast."""
+    global openai_client
+    if openai_client is None:
+        import openai
+
+        openai_client = openai.AsyncOpenAI(
+            api_key=config.OPENAI_API_KEY,
+            max_retries=config.HTTP_RETRIES,
+            http_client=create_async_client()
+        )
+    return openai_client
+
+# Analyses in progress, so concurrent requests for the same video and options share one
+analysis_flights = SingleFlight()
 
 # ================ MODELS ================
 
 class VideoRequest(BaseModel):
     video_url: str = Field(..., description="Supabase public bucket URL of the video to analyze")
 
+class AnalysisOptions(BaseModel):
+    frame_skip: int = Field(config.DEFAULT_FRAME_SKIP, description="Process every Nth frame")
+    sampling_mode: str = Field(config.DEFAULT_SAMPLING_MODE, description="How skipped frames are handled: read, grab or seek")
+    samples_per_second: Optional[float] = Field(None, description="Sample this many frames per second instead of using frame_skip")
+    batch_size: int = Field(config.DEFAULT_BATCH_SIZE, description="Number of frames per pose model call")
+    search_mode: str = Field(config.DEFAULT_SEARCH_MODE, description="fixed or adaptive search for the minimum knee angle")
+    snapshots: int = Field(config.DEFAULT_SNAPSHOTS, description="Number of lowest-angle frames from distinct reps sent to the vision model")
+    segments: int = Field(config.DEFAULT_SEGMENTS, description="Number of time segments processed in parallel")
+    pose_backend: str = Field(DEFAULT_BACKEND, description="Pose backend name, or auto to pick one per video")
+
+class RepDetail(BaseModel):
+    rep: int = Field(..., description="Rep number, starting at 1")
+    start_frame: int = Field(..., description="Frame where the descent started")
+    bottom_frame: int = Field(..., description="Frame with the lowest knee angle of the rep")
+    end_frame: int = Field(..., description="Frame where the ascent finished")
+    min_angle: float = Field(..., description="Lowest knee angle of the rep (depth)")
+    eccentric_seconds: Optional[float] = Field(None, description="Descent duration")
+    concentric_seconds: Optional[float] = Field(None, description="Ascent duration")
+    time_under_tension: Optional[float] = Field(None, description="Total rep duration")
+
+class RepAnalysis(BaseModel):
+    rep_count: int = Field(..., description="Number of completed reps")
+    reps: List[RepDetail] = Field(..., description="Per-rep depth and tempo")
+    fps: Optional[float] = Field(None, description="Video frame rate used for timings")
+    frame_indices: List[int] = Field(..., description="Frame index of each sample in the series")
+    knee_angles: List[float] = Field(..., description="Raw knee angle per sample")
+    smoothed_angles: List[float] = Field(..., description="Smoothed knee angle per sample")
+    joint_angles: Dict[str, List[Optional[float]]] = Field(default_factory=dict, description="Angle of each POSE_JOINTS joint per sample, of the person with the lowest knee angle; null where nobody was detected")
+
 class AnalysisResponse(BaseModel):
     image_url: str = Field(..., description="URL to the analyzed image")
     min_knee_angle: float = Field(..., description="Minimum knee angle detected in the video")
@@ -69,13 +141,87 @@ class AnalysisResponse(BaseModel):
     improvements: str = Field(..., description="Recommendations for improvement")
     risk_factor: str = Field(..., description="Risk factor assessment")
     audio_url: Optional[str] = Field(None, description="URL to the audio summary")
+    thumbnail_url: Optional[str] = Field(None, description="URL to a small thumbnail of the analyzed image")
+    frames_inferred: Optional[int] = Field(None, description="Number of frames run through the pose model")
+    pose_backend: Optional[str] = Field(None, description="Pose backend used for the video")
+    stage_timings: Optional[Dict[str, float]] = Field(None, description="Duration of each pipeline stage in seconds")
+    rep_analysis: Optional[RepAnalysis] = Field(None, description="Knee-angle series and rep segmentation")
+    snapshot_frames: Optional[List[Dict[str, float]]] = Field(None, description="Frame index and knee angle of each snapshot sent to the vision model")
+
+class JobResponse(BaseModel):
+    job_id: str = Field(..., description="Identifier of the analysis job")
+    status: str = Field(..., description="Job status: queued, running, completed or failed")
+    created_at: Optional[float] = Field(None, description="Unix time the job was queued")
+    started_at: Optional[float] = Field(None, description="Unix time the job started running")
+    finished_at: Optional[float] = Field(None, description="Unix time the job finished")
+    result: Optional[AnalysisResponse] = Field(None, description="Analysis result when the job is completed")
+    error: Optional[str] = Field(None, description="Error message when the job failed")
+
+class BatchRequest(BaseModel):
+    video_urls: List[str] = Field(..., min_length=1, max_length=config.BATCH_MAX_VIDEOS, description="Supabase public bucket URLs of the videos of one session")
+
+class BatchVideoResult(BaseModel):
+    video_url: str = Field(..., description="URL of the video")
+    status_code: int = Field(..., description="200 when the video was analyzed, otherwise the HTTP status of the error")
+    result: Optional[AnalysisResponse] = Field(None, description="Analysis of the video when it succeeded")
+    error: Optional[str] = Field(None, description="Error message when the analysis failed")
+
+class SessionSummary(BaseModel):
+    video_count: int = Field(..., description="Number of distinct videos in the batch")
+    succeeded: int = Field(..., description="Number of videos analyzed")
+    failed: int = Field(..., description="Number of videos that failed")
+    total_reps: int = Field(..., description="Completed reps across all analyzed videos")
+    min_knee_angle: Optional[float] = Field(None, description="Lowest knee angle across all analyzed videos")
+    mean_min_knee_angle: Optional[float] = Field(None, description="Average of the minimum knee angle of each analyzed video")
+    session_analysis: Optional[str] = Field(None, description="Vision model assessment of the session as a whole, from the analyses of every video")
+    vision_requests: int = Field(..., description="Number of vision model requests made for the batch: the combined image requests, the separate requests for videos they missed and the session assessment")
+    wall_seconds: float = Field(..., description="Wall-clock time of the whole batch")
+
+class BatchResponse(BaseModel):
+    results: List[BatchVideoResult] = Field(..., description="One entry per requested video, in request order")
+    summary: SessionSummary = Field(..., description="Session-level summary")
 
 # ================ APPLICATION ================
 
+def startup_pools() -> List[ModelPool]:
+    """Model pools of the backends requests get by default, loaded and warmed at startup."""
+    return [pose_backends.pool(name) for name in pose_backends.enabled(DEFAULT_BACKEND)]
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Fork the inference processes, then start serving right away and load and warm the pose models
+    in the background; /readyz reports when they are warm.
+    """
+    check_required_settings()
+    await asyncio.to_thread(open_caches)
+    if checkpoint_store is not None:
+        pruned = await asyncio.to_thread(checkpoint_store.prune)
+        logger.info(f"Removed {pruned} expired analysis checkpoint(s)")
+    # Fork the inference processes before this process runs any inference, so before serving requests
+    inference_pool.start()
+    warmup = None
+    if config.WARMUP_ON_STARTUP:
+        warmup = asyncio.create_task(prepare(startup_pools()))
+    else:
+        # Models load on the first request instead
+        startup_state.mark_ready()
+    startup_state.mark_serving()
+    yield
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    analysis_executor.shutdown(wait=False, cancel_futures=True)
+    pose_backends.close()
+    inference_pool.close()
+    await http_clients.aclose()
+    if openai_client is not None:
+        await openai_client.close()
+
 app = FastAPI(
     title="Exercise Analysis API",
     description="API for analyzing exercise videos and returning the frame with the lowest knee angle, along with GPT-4 analysis and audio summary",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -131,20 +277,13 @@ def generate_unique_filename(prefix: str, extension: str) -> str:
     """Generate a unique filename with timestamp and random bytes."""
     return f"{prefix}_{int(time.time())}_{os.urandom(4).hex()}.{extension}"
 
-def upload_to_supabase(file_data: bytes, filename: str, content_type: str) -> str:
+async def upload_to_supabase(file_data: bytes, filename: str, content_type: str) -> str:
     """Upload file to Supabase storage and return the public URL."""
     try:
         logger.info(f"Uploading {filename} to Supabase bucket: {config.SUPABASE_BUCKET}")
         
-        # Upload the file to Supabase
-        response = supabase.storage.from_(config.SUPABASE_BUCKET).upload(
-            path=filename,
-            file=file_data,
-            file_options={"content-type": content_type}
-        )
-        
-        # Get the public URL
-        public_url = supabase.storage.from_(config.SUPABASE_BUCKET).get_public_url(filename)
+        # Upload the file to Supabase, the public URL is built without another request
+        public_url = await storage.upload(file_data, filename, content_type)
         logger.info(f"File uploaded successfully. Public URL: {public_url}")
         
         return public_url
@@ -152,96 +291,181 @@ def upload_to_supabase(file_data: bytes, filename: str, content_type: str) -> st
         logger.error(f"Error uploading to Supabase: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error uploading to Supabase: {str(e)}")
 
+def get_analysis_options(
+    frame_skip: int = Query(config.DEFAULT_FRAME_SKIP, ge=config.MIN_FRAME_SKIP, le=config.MAX_FRAME_SKIP),
+    sampling_mode: str = Query(config.DEFAULT_SAMPLING_MODE, pattern=f"^({'|'.join(SAMPLING_MODES)})$"),
+    samples_per_second: Optional[float] = Query(None, gt=0, le=config.MAX_SAMPLES_PER_SECOND),
+    batch_size: int = Query(config.DEFAULT_BATCH_SIZE, ge=1, le=config.MAX_BATCH_SIZE),
+    search_mode: str = Query(config.DEFAULT_SEARCH_MODE, pattern=f"^({'|'.join(SEARCH_MODES)})$"),
+    snapshots: int = Query(config.DEFAULT_SNAPSHOTS, ge=1, le=config.MAX_SNAPSHOTS),
+    segments: int = Query(config.DEFAULT_SEGMENTS, ge=1, le=config.MAX_SEGMENTS),
+    pose_backend: str = Query(DEFAULT_BACKEND, pattern=f"^({'|'.join([AUTO_BACKEND] + pose_backends.names)})$")
+) -> AnalysisOptions:
+    """Collect the analysis query parameters shared by all analyze endpoints."""
+    return AnalysisOptions(
+        frame_skip=frame_skip,
+        sampling_mode=sampling_mode,
+        samples_per_second=samples_per_second,
+        batch_size=batch_size,
+        search_mode=search_mode,
+        snapshots=snapshots,
+        segments=segments,
+        pose_backend=pose_backend
+    )
+
+def validate_video_url(url: str) -> None:
+    """Raise ValueError unless the URL is an https URL from an allowed domain."""
+    valid_domain = any(domain in url for domain in config.ALLOWED_VIDEO_DOMAINS)
+    if not url.startswith('https://') or not valid_domain:
+        raise ValueError(f"Invalid URL format. URL must be from an allowed domain: {', '.join(config.ALLOWED_VIDEO_DOMAINS)}")
+
 # ================ API FUNCTIONS ================
 
-def process_video_from_url(url: str, frame_skip: int = config.DEFAULT_FRAME_SKIP) -> Dict[str, Any]:
-    """Process video directly from URL and return the frame with the lowest knee angle."""
+def process_video_from_url(
+    url: str,
+    options: Optional[AnalysisOptions] = None,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Process video directly from URL and return the encoded frame with the lowest knee angle.
+    With options.snapshots > 1, also returns a tiled image of the lowest-angle frames of distinct reps.
+    If given, on_progress is called periodically with the frame progress and running minimum angle.
+    """
+    import cv2
+
+    options = options or AnalysisOptions()
     try:
         # Validate URL format
-        valid_domain = any(domain in url for domain in config.ALLOWED_VIDEO_DOMAINS)
-        if not url.startswith('https://') or not valid_domain:
-            raise ValueError(f"Invalid URL format. URL must be from an allowed domain: {', '.join(config.ALLOWED_VIDEO_DOMAINS)}")
+        validate_video_url(url)
             
         logger.info(f"Processing video from URL: {url}")
         
-        # Create a video capture object directly from the URL
-        cap = cv2.VideoCapture(url)
-        if not cap.isOpened():
-            # If direct URL capture fails, try downloading to memory and processing
-            logger.info("Direct URL capture failed, trying to download video to memory")
-            response = requests.get(url, timeout=config.HTTP_TIMEOUT)
-            response.raise_for_status()
-            
-            # Convert to numpy array and create video capture from memory
-            video_array = np.asarray(bytearray(response.content), dtype=np.uint8)
-            cap = cv2.VideoCapture()
-            cap.open(cv2.CAP_OPENCV_MJPEG, video_array)
-            
-            if not cap.isOpened():
-                raise HTTPException(status_code=400, detail="Error reading video from URL")
-
-        # Initialize AIGym
-        logger.info("Initializing AIGym")
-        gym = solutions.AIGym(
-            show=False,
-            kpts=config.POSE_KEYPOINTS,
-            model=config.POSE_MODEL,
-            line_width=config.POSE_LINE_WIDTH,
-            verbose=False,
-        )
-
-        min_angle = float('inf')
-        best_frame = None
-        frame_count = 0
-        processed_count = 0
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        # Open the video, streaming it to a bounded temporary file if it cannot be read directly
+        with open_video_source(url) as (source, cap):
+            min_angle = float('inf')
+            best_frame = None
+            processed_count = 0
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            # Snapshots must be far enough apart to come from different reps
+            min_separation = int(fps * config.SNAPSHOT_MIN_SEPARATION_SECONDS) if options.snapshots > 1 and fps > 0 else 0
+            track = PoseTrack(num_joints=len(joint_angle_engine.joints), top_k=options.snapshots, min_separation=min_separation)
+            reps = RepSegmenter(fps=fps)
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            frame_step = resolve_frame_step(cap, options.frame_skip, options.samples_per_second)
+            # Pick the pose model from the resolution, the number of samples and the current load
+            backend = pose_backends.select(
+                options.pose_backend,
+                int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                max(0, total_frames) // frame_step,
+                job_manager.pending
+            )
+            pool = pose_backends.pool(backend)
         
-        logger.info(f"Total frames in video: {total_frames}")
-        logger.info(f"Processing every {frame_skip}th frame")
+            logger.info(f"Total frames in video: {total_frames}")
+            logger.info(
+                f"Processing every {frame_step}th frame using {options.sampling_mode} sampling, "
+                f"{options.search_mode} search, batch size {options.batch_size}, {options.segments} segment(s), "
+                f"pose backend {backend}"
+            )
         
-        # Process frames
-        while cap.isOpened():
-            success, frame = cap.read()
-            if not success:
-                break
-
-            # Process only every Nth frame
-            if frame_count % frame_skip == 0:
-                processed_frame, knee_angle = custom_monitor(gym, frame)
+            # Borrow a pre-loaded model from the pool instead of loading one per request
+            with pool.checkout() as gym:
+                # The pipeline stages are closed before the frames are re-read, so no thread touches the capture anymore
+                with ExitStack() as stages:
+                    # Phase one records angles and keypoints only, nothing is drawn or copied
+                    if options.search_mode == "adaptive":
+                        # Coarse pass at frame_step, then dense passes around the lowest angles
+                        monitored_frames = adaptive_search(cap, gym, frame_step, options.sampling_mode, options.batch_size, annotate=False)
+                    elif options.segments > 1 and total_frames > 0:
+                        # Time segments with their own captures and model instances, merged back in frame order
+                        monitored_frames = segmented_frames(
+                            source, gym, total_frames, frame_step, options.segments, options.batch_size, pool
+                        )
+                    else:
+                        # Process only every Nth frame, skipped frames are not decoded unless sampling_mode is "read".
+                        # Decoding runs on its own thread, ahead of inference by up to PIPELINE_QUEUE_SIZE frames
+                        sampled_frames = stages.enter_context(closing(
+                            prefetch(sample_frames(cap, frame_step, options.sampling_mode), name="decode")
+                        ))
+                        monitored_frames = monitor_frames(gym, sampled_frames, options.batch_size, annotate=False)
 
-                if knee_angle < min_angle:
-                    min_angle = knee_angle
-                    best_frame = processed_frame.copy()
+                    # Inference runs on its own thread too, this one only does the post-processing
+                    pose_frames = stages.enter_context(closing(prefetch(monitored_frames, name="inference")))
+                    for frame_count, frame, knee_angle, joint_angles, keypoints in pose_frames:
+                        track.append(frame_count, knee_angle, joint_angles, keypoints, frame)
+                        reps.update(frame_count, knee_angle)
+                        min_angle = min(min_angle, knee_angle)
                 
-                processed_count += 1
-                if processed_count % 20 == 0:
-                    logger.info(f"Processed {processed_count} frames ({frame_count}/{total_frames} total)")
+                        processed_count += 1
+                        if processed_count % 20 == 0:
+                            logger.info(f"Processed {processed_count} frames ({frame_count}/{total_frames} total)")
 
-            frame_count += 1
+                        if on_progress is not None and processed_count % config.STREAM_PROGRESS_INTERVAL == 0:
+                            on_progress({
+                                "frames_processed": processed_count,
+                                "frame_index": frame_count,
+                                "total_frames": total_frames,
+                                "min_knee_angle": float(min_angle)
+                            })
+
+                # Phase two re-fetches and annotates only the winning frame(s)
+                snapshot_frames = []
+                snapshot_images = []
+                for top in track.top_frames():
+                    frame = read_frame_at(cap, top.frame_index)
+                    if frame is None:
+                        # Sources that cannot seek fall back to the frame kept from phase one
+                        frame = top.frame
+                    if frame is None:
+                        raise HTTPException(status_code=500, detail=f"Error re-reading frame {top.frame_index} from video")
+                    annotate_frame(gym, frame, top.keypoints)
+                    snapshot_frames.append({"frame_index": top.frame_index, "knee_angle": round(top.knee_angle, 2)})
+                    snapshot_images.append(frame)
+
+                if snapshot_images:
+                    best_frame = snapshot_images[0]
+                    min_angle = track.best().knee_angle
 
-        cap.release()
         logger.info(f"Video processing completed. Processed {processed_count} out of {total_frames} frames")
 
         if best_frame is not None:
-            # Generate a unique filename for the image
-            filename = generate_unique_filename("exercise_analysis", "png")
-            
-            # For GPT-4 analysis, we need the base64 encoding
-            _, buffer = cv2.imencode('.png', best_frame)
-            best_frame_bytes = buffer.tobytes()
-            best_frame_base64 = base64.b64encode(best_frame_bytes).decode('utf-8')
-            
-            # Upload the image to Supabase
-            image_url = upload_to_supabase(best_frame_bytes, filename, "image/png")
-            
+            # Encode each image once; the same bytes are uploaded and sent to the vision model
+            image = encode_image(best_frame)
+            thumbnail = encode_image(best_frame, max_dim=config.THUMBNAIL_MAX_DIM) if config.THUMBNAIL_MAX_DIM else None
+
+            if len(snapshot_images) > 1:
+                # Several snapshots are downscaled and tiled into one image so they go out in a single vision request
+                tiled = tile_frames(
+                    [downscale_frame(frame, config.SNAPSHOT_MAX_DIM) for frame in snapshot_images],
+                    [f"{i + 1}: {snapshot['knee_angle']:.0f} deg" for i, snapshot in enumerate(snapshot_frames)]
+                )
+                vision_image = encode_image(tiled, max_dim=config.VISION_IMAGE_MAX_DIM)
+            elif max(image.width, image.height) > config.VISION_IMAGE_MAX_DIM:
+                vision_image = encode_image(best_frame, max_dim=config.VISION_IMAGE_MAX_DIM)
+            else:
+                vision_image = image
+
+            joint_angles = track.joint_angle_series(joint_angle_engine.joints)
+            # The primary column is the knee angle, already reported as knee_angles
+            joint_angles.pop("primary", None)
+
+            # The upload happens in process_and_analyze_video, concurrently with the vision request
             return {
-                "image_base64": best_frame_base64,  # Only used internally for GPT-4 analysis
-                "image_filename": filename,
-                "image_url": image_url,
-                "min_knee_angle": float(min_angle)
+                "image": image,
+                "thumbnail": thumbnail,
+                "vision_image": vision_image,  # Only used internally for GPT-4 analysis
+                "snapshot_frames": snapshot_frames,
+                "image_filename": generate_unique_filename("exercise_analysis", image.extension),
+                "min_knee_angle": float(min_angle),
+                "frames_inferred": processed_count,
+                "pose_backend": backend,
+                "rep_analysis": {**reps.summary(), "joint_angles": joint_angles}
             }
         else:
             raise HTTPException(status_code=400, detail="No valid frames found in video")
+    except HTTPException:
+        raise
     except requests.exceptions.RequestException as e:
         logger.error(f"Error downloading video: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Error downloading video from URL: {str(e)}")
@@ -249,53 +473,25 @@ def process_video_from_url(url: str, frame_skip: int = config.DEFAULT_FRAME_SKIP
         logger.error(f"Error in video processing: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error in video processing: {str(e)}")
 
-def custom_monitor(ai_gym, frame) -> Tuple[np.ndarray, float]:
-    """Process a frame with AIGym and return the processed frame and knee angle."""
-    tracks = ai_gym.model.track(source=frame, persist=True, classes=ai_gym.CFG["classes"], **ai_gym.track_add_args)[0]
-    min_knee_angle = None
-
-    if tracks.boxes.id is not None:
-        if len(tracks) > len(ai_gym.count):
-            new_human = len(tracks) - len(ai_gym.count)
-            ai_gym.angle += [0] * new_human
-            ai_gym.count += [0] * new_human
-            ai_gym.stage += ["-"] * new_human
-
-        ai_gym.annotator = Annotator(frame, line_width=ai_gym.line_width)
-
-        for ind, k in enumerate(reversed(tracks.keypoints.data)):
-            kpts = [k[int(ai_gym.kpts[i])].cpu() for i in range(3)]
-            ai_gym.angle[ind] = ai_gym.annotator.estimate_pose_angle(*kpts)
-            
-            # Draw lines connecting the 3 keypoints
-            im0 = ai_gym.annotator.draw_specific_points(k, ai_gym.kpts, radius=ai_gym.line_width * 2)
-            
-            # Manually draw white lines connecting the keypoints
-            for i in range(len(ai_gym.kpts) - 1):
-                pt1 = (int(k[int(ai_gym.kpts[i])][0]), int(k[int(ai_gym.kpts[i])][1]))
-                pt2 = (int(k[int(ai_gym.kpts[i+1])][0]), int(k[int(ai_gym.kpts[i+1])][1]))
-                cv2.line(frame, pt1, pt2, (255, 255, 255), thickness=ai_gym.line_width)
-
-            if min_knee_angle is None or ai_gym.angle[ind] < min_knee_angle:
-                min_knee_angle = ai_gym.angle[ind]
-
-            if ai_gym.angle[ind] < config.DANGER_ANGLE_THRESHOLD:
-                ai_gym.stage[ind] = 'danger'
-                color = config.DANGER_COLOR
-            else:
-                ai_gym.stage[ind] = 'normal'
-                color = config.NORMAL_COLOR
-            
-            # x, y = int(k[14][0]), int(k[14][1])
-            # cv2.circle(frame, (x + config.CIRCLE_OFFSET_X, y), config.CIRCLE_RADIUS, color, config.CIRCLE_THICKNESS)
-
-    return frame, (min_knee_angle if min_knee_angle is not None else 180)
-
-def analyze_with_gpt4(image_base64: str, knee_angle: float) -> Dict[str, str]:
-    """Analyze the exercise posture using GPT-4 Vision API."""
+async def analyze_with_gpt4(
+    image_base64: str,
+    knee_angle: float,
+    snapshot_frames: Optional[List[Dict[str, float]]] = None,
+    mime_type: str = "image/png"
+) -> Dict[str, Any]:
+    """Analyze the exercise posture using GPT-4 Vision API, from one frame or a tiled set of snapshots."""
     try:
         # Prepare the prompt
-        prompt = f"""Analyze this exercise image focusing on the knee angle (currently {knee_angle} degrees) and the red circle indicator.
+        if snapshot_frames and len(snapshot_frames) > 1:
+            angles = ", ".join(f"{i + 1}: {snapshot['knee_angle']} degrees" for i, snapshot in enumerate(snapshot_frames))
+            subject = (
+                f"Analyze these {len(snapshot_frames)} numbered snapshots of the lowest point of different reps "
+                f"of the same exercise set (knee angles {angles}). The lowest knee angle is {knee_angle} degrees. "
+                f"Point out form issues in any of the reps, referring to them by number."
+            )
+        else:
+            subject = f"Analyze this exercise image focusing on the knee angle (currently {knee_angle} degrees) and the red circle indicator."
+        prompt = f"""{subject}
         Provide a detailed analysis, must be in the following format:
 
         1. [SUMMARY]: [SUMMARY OF THE ANALYSIS]
@@ -304,27 +500,37 @@ def analyze_with_gpt4(image_base64: str, knee_angle: float) -> Dict[str, str]:
 
         Be specific and actionable in your feedback for points 2 and 3."""
 
+        # Identical prompt and image bytes get the same analysis without another API call
+        cache_key = vision_cache_key(prompt, image_base64) if vision_cache is not None else None
+        if cache_key is not None:
+            cached = vision_cache.get(cache_key)
+            OPENAI_CACHE_LOOKUPS.inc(kind="vision", result="hit" if cached is not None else "miss")
+            if cached is not None:
+                logger.info("Returning cached GPT-4 analysis")
+                return cached
+
         logger.info("Sending request to GPT-4 Vision API")
         
         # Call GPT-4 Vision API
-        response = openai_client.chat.completions.create(
-            model=config.OPENAI_VISION_MODEL,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/png;base64,{image_base64}"
+        with VISION_SECONDS.time():
+            response = await get_openai_client().chat.completions.create(
+                model=config.OPENAI_VISION_MODEL,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "text", "text": prompt},
+                            {
+                                "type": "image_url",
+                                "image_url": {
+                                    "url": f"data:{mime_type};base64,{image_base64}"
+                                }
                             }
-                        }
-                    ]
-                }
-            ],
-            max_tokens=config.OPENAI_VISION_MAX_TOKENS
-        )
+                        ]
+                    }
+                ],
+                max_tokens=config.OPENAI_VISION_MAX_TOKENS
+            )
 
         # Get the analysis text
         analysis_text = response.choices[0].message.content
@@ -343,9 +549,13 @@ def analyze_with_gpt4(image_base64: str, knee_angle: float) -> Dict[str, str]:
             """
             logger.info("Using fallback structured response")
 
-        return {
+        result = {
             "text_analysis": analysis_text,
+            "is_fallback": False,
         }
+        if cache_key is not None:
+            vision_cache.set(cache_key, result)
+        return result
 
     except Exception as e:
         logger.error(f"Error in GPT-4 analysis: {str(e)}")
@@ -359,19 +569,162 @@ def analyze_with_gpt4(image_base64: str, knee_angle: float) -> Dict[str, str]:
         """
         return {
             "text_analysis": fallback_analysis,
+            "is_fallback": True,
         }
 
-def generate_audio_from_text(text: str, voice: str = config.OPENAI_TTS_VOICE) -> Optional[str]:
-    """Generate audio from text using OpenAI's TTS API and upload directly to Supabase."""
+# Section headers of a combined response, e.g. "### VIDEO 2" or "**VIDEO 2:**"
+BATCH_SECTION_PATTERN = re.compile(r'^[ \t]*[#*]+[ \t]*VIDEO[ \t]+(\d+)\b[*:]*\s*', re.IGNORECASE | re.MULTILINE)
+
+def split_batch_response(text: str, count: int) -> List[Optional[str]]:
+    """Split a combined vision response into the analysis of each video, None where missing."""
+    sections: List[Optional[str]] = [None] * count
+    matches = list(BATCH_SECTION_PATTERN.finditer(text))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        body = text[match.end():end].strip()
+        if 1 <= int(match.group(1)) <= count:
+            sections[int(match.group(1)) - 1] = body or None
+    return sections
+
+async def analyze_batch_with_gpt4(items: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Analyze the vision images of several videos of one session in a single GPT-4 Vision request.
+    Returns one analysis per video, None where the response has no usable section for it.
+    """
+    angles = ", ".join(f"{i + 1}: {item['min_knee_angle']:.1f} degrees" for i, item in enumerate(items))
+    prompt = f"""These {len(items)} images come from {len(items)} videos of the same exercise session, in order.
+        Image N shows the lowest point of video N (minimum knee angles {angles}); images with several numbered tiles show the lowest point of several reps of that video.
+        For each video, write a section starting with "### VIDEO N" in the following format:
+
+        1. [SUMMARY]: [SUMMARY OF THE ANALYSIS]
+        2. [IMPROVEMENTS]: [RECOMMENDATIONS FOR IMPROVEMENT]
+        3. [RISK FACTOR]: [RISK FACTOR OF THE EXERCISE]
+
+        Be specific and actionable in your feedback."""
+
+    images = [item["vision_image"] for item in items]
+    try:
+        cache_key = vision_cache_key(prompt, "".join(image.base64 for image in images)) if vision_cache is not None else None
+        cached = vision_cache.get(cache_key) if cache_key is not None else None
+        if cache_key is not None:
+            OPENAI_CACHE_LOOKUPS.inc(kind="vision_batch", result="hit" if cached is not None else "miss")
+        if cached is not None:
+            analysis_text = cached["text_analysis"]
+        else:
+            logger.info(f"Sending combined request for {len(items)} videos to GPT-4 Vision API")
+            with VISION_SECONDS.time():
+                response = await get_openai_client().chat.completions.create(
+                    model=config.OPENAI_VISION_MODEL,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": [{"type": "text", "text": prompt}] + [
+                                {"type": "image_url", "image_url": {"url": image.data_url}} for image in images
+                            ]
+                        }
+                    ],
+                    max_tokens=config.OPENAI_VISION_MAX_TOKENS * len(items)
+                )
+            analysis_text = response.choices[0].message.content
+    except Exception as e:
+        logger.error(f"Error in combined GPT-4 analysis: {str(e)}")
+        return [None] * len(items)
+
+    sections = split_batch_response(analysis_text, len(items))
+    analyses = [
+        {"text_analysis": section, "is_fallback": False}
+        if section and all(name in section.upper() for name in ["SUMMARY", "IMPROVEMENTS", "RISK FACTOR"]) else None
+        for section in sections
+    ]
+    # Only cache a response that answered for every video
+    if cache_key is not None and cached is None and all(analyses):
+        vision_cache.set(cache_key, {"text_analysis": analysis_text, "is_fallback": False})
+    return analyses
+
+async def analyze_batch_with_fallback(items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Analyze several videos in one combined request; videos the response does not cover get a request of their own.
+    Returns one analysis per video and the number of vision requests made.
+    """
+    analyses = await analyze_batch_with_gpt4(items)
+    missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+    if missing:
+        logger.warning(f"Combined analysis missed {len(missing)} of {len(items)} videos, analyzing them separately")
+        singles = await asyncio.gather(*(
+            analyze_with_gpt4(
+                items[i]["vision_image"].base64, items[i]["min_knee_angle"],
+                items[i]["snapshot_frames"], items[i]["vision_image"].content_type
+            )
+            for i in missing
+        ))
+        for i, analysis in zip(missing, singles):
+            analyses[i] = analysis
+    return analyses, 1 + len(missing)
+
+async def summarize_session(analyses: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Assess a whole session from the per-video analyses in one text-only request, so the assessment
+    covers every video even when their images were sent in several combined requests.
+    """
+    videos = "\n".join(
+        f"Video {i + 1}: minimum knee angle {analysis['min_knee_angle']:.1f} degrees, "
+        f"{(analysis.get('rep_analysis') or {}).get('rep_count', 0)} reps. "
+        f"Summary: {analysis['summary']} Improvements: {analysis['improvements']} Risk factor: {analysis['risk_factor']}"
+        for i, analysis in enumerate(analyses)
+    )
+    prompt = f"""These are the analyses of {len(analyses)} videos of the same exercise session, in order:
+
+        {videos}
+
+        Assess the session as a whole in a short paragraph: consistency across videos, recurring issues and the main thing to work on."""
+
+    try:
+        cache_key = vision_cache_key(prompt, "") if vision_cache is not None else None
+        cached = vision_cache.get(cache_key) if cache_key is not None else None
+        if cache_key is not None:
+            OPENAI_CACHE_LOOKUPS.inc(kind="session", result="hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached["text_analysis"]
+
+        logger.info(f"Requesting session assessment over {len(analyses)} videos")
+        with VISION_SECONDS.time():
+            response = await get_openai_client().chat.completions.create(
+                model=config.OPENAI_VISION_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=config.OPENAI_VISION_MAX_TOKENS
+            )
+        session = response.choices[0].message.content
+    except Exception as e:
+        logger.error(f"Error in session assessment: {str(e)}")
+        return None
+
+    if cache_key is not None and session:
+        vision_cache.set(cache_key, {"text_analysis": session, "is_fallback": False})
+    return session or None
+
+async def generate_audio_from_text(text: str, voice: str = config.OPENAI_TTS_VOICE) -> Optional[str]:
+    """
+    Generate audio from text using OpenAI's TTS API and upload directly to Supabase.
+    Audio for text already spoken with the same model and voice reuses the uploaded file.
+    """
     try:
+        cache_key = tts_cache_key(text, voice) if tts_cache is not None else None
+        if cache_key is not None:
+            cached_url = tts_cache.get(cache_key)
+            OPENAI_CACHE_LOOKUPS.inc(kind="tts", result="hit" if cached_url is not None else "miss")
+            if cached_url is not None:
+                logger.info(f"Reusing cached audio: {cached_url}")
+                return cached_url
+
         logger.info(f"Generating audio for text: {text[:50]}...")
         
         # Generate speech using OpenAI's TTS
-        response = openai_client.audio.speech.create(
-            model=config.OPENAI_TTS_MODEL,
-            voice=voice,
-            input=text
-        )
+        with TTS_SECONDS.time():
+            response = await get_openai_client().audio.speech.create(
+                model=config.OPENAI_TTS_MODEL,
+                voice=voice,
+                input=text
+            )
         
         # Get the audio data
         audio_data = response.content
@@ -380,7 +733,9 @@ def generate_audio_from_text(text: str, voice: str = config.OPENAI_TTS_VOICE) ->
         audio_filename = generate_unique_filename("exercise_audio", "mp3")
         
         # Upload to Supabase
-        audio_url = upload_to_supabase(audio_data, audio_filename, "audio/mpeg")
+        audio_url = await upload_to_supabase(audio_data, audio_filename, "audio/mpeg")
+        if cache_key is not None:
+            tts_cache.set(cache_key, audio_url)
         
         logger.info("Audio generation and upload successful")
         return audio_url
@@ -453,52 +808,314 @@ def parse_gpt4_response(text: str) -> Dict[str, str]:
             "risk_factor": "Error parsing response"
         }
 
+def result_options(options: AnalysisOptions) -> Dict[str, Any]:
+    """Options that change the result; batch size and segments only change how fast it is computed."""
+    return options.model_dump(exclude={"batch_size", "segments"})
+
+async def analysis_cache_key(video_url: str, options: AnalysisOptions) -> Optional[str]:
+    """Return the result cache key of a video and options, or None when the result cache is disabled."""
+    if result_cache is None:
+        return None
+    validate_video_url(video_url)
+    validator = await asyncio.to_thread(fetch_video_validator, video_url)
+    return result_cache_key(video_url, validator, result_options(options))
+
+def backend_cache_key(cache_key: str, backend: str) -> str:
+    """Key of a result computed with a given pose backend, derived from the key of the requested options."""
+    model = pose_backends.backends[backend].model if backend in pose_backends.backends else None
+    return hash_key(cache_key, backend, model)
+
+def get_cached_analysis(cache_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a cached result. The entry under the requested options only names the backend that ran,
+    so under auto a repeat request gets the result of the same model, whatever the current load.
+    """
+    entry = result_cache.get(cache_key)
+    if entry is None or "pose_backend" not in entry:
+        return None
+    return result_cache.get(backend_cache_key(cache_key, entry["pose_backend"]))
+
+def set_cached_analysis(cache_key: str, analysis: Dict[str, Any]) -> None:
+    result_cache.set(backend_cache_key(cache_key, analysis["pose_backend"]), analysis)
+    result_cache.set(cache_key, {"pose_backend": analysis["pose_backend"]})
+
+async def upload_result_images(results: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Upload the analyzed image and its thumbnail concurrently and return their URLs."""
+    image, thumbnail = results["image"], results["thumbnail"]
+    uploads = [upload_to_supabase(image.data, results["image_filename"], image.content_type)]
+    if thumbnail is not None:
+        thumbnail_filename = generate_unique_filename("exercise_thumbnail", thumbnail.extension)
+        uploads.append(upload_to_supabase(thumbnail.data, thumbnail_filename, thumbnail.content_type))
+    image_url, *thumbnail_url = await asyncio.gather(*uploads)
+    return image_url, thumbnail_url[0] if thumbnail_url else None
+
+def combine_analysis(
+    results: Dict[str, Any],
+    image_url: str,
+    thumbnail_url: Optional[str],
+    gpt4_results: Dict[str, Any],
+    parsed_sections: Dict[str, str],
+    audio_url: Optional[str],
+    stage_timings: Dict[str, float]
+) -> Dict[str, Any]:
+    """Build the analysis response of one video from the outputs of each stage."""
+    return {
+        "image_url": image_url,
+        "min_knee_angle": results["min_knee_angle"],
+        "text_analysis": gpt4_results["text_analysis"],
+        "summary": parsed_sections["summary"],
+        "improvements": parsed_sections["improvements"],
+        "risk_factor": parsed_sections["risk_factor"],
+        "audio_url": audio_url,
+        "thumbnail_url": thumbnail_url,
+        "frames_inferred": results["frames_inferred"],
+        "pose_backend": results["pose_backend"],
+        "stage_timings": stage_timings,
+        "rep_analysis": results["rep_analysis"],
+        "snapshot_frames": results["snapshot_frames"]
+    }
+
 async def process_and_analyze_video(
     video_url: str, 
-    frame_skip: int = config.DEFAULT_FRAME_SKIP
+    options: Optional[AnalysisOptions] = None,
+    on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Process a video, analyze it, and return the results.
+    If given, on_event(name, data) is called as each stage finishes: progress, image, analysis and audio.
+    Concurrent calls for the same video and options attach to one analysis and all receive its result;
+    a caller that joins late receives the events from then on.
+    """
+    options = options or AnalysisOptions()
+    key = hash_key(video_url, result_options(options))
+    return await analysis_flights.run(key, partial(run_analysis, video_url, options), on_event)
+
+async def run_analysis(
+    video_url: str,
+    options: AnalysisOptions,
+    emit: Callable[[str, Dict[str, Any]], None]
 ) -> Dict[str, Any]:
-    """Process a video, analyze it, and return the results."""
+    """Run every stage of one analysis, resuming from the stages an earlier, interrupted attempt completed."""
     try:
-        # Process video directly from URL with frame skipping
-        results = process_video_from_url(video_url, frame_skip)
-        
-        # Get GPT-4 analysis
-        gpt4_results = analyze_with_gpt4(results["image_base64"], results["min_knee_angle"])
-        
-        # Extract sections from analysis
-        analysis_text = gpt4_results["text_analysis"]
-        
-        # Log the analysis text for debugging
-        logger.info(f"Analysis text received: {analysis_text[:100]}...")
-        
-        # Parse the GPT-4 response
-        parsed_sections = parse_gpt4_response(analysis_text)
-        
-        # Generate audio from summary
-        logger.info("Generating audio from summary")
-        audio_url = None
-        try:
-            audio_url = generate_audio_from_text(parsed_sections["summary"])
-        except Exception as e:
-            logger.error(f"Error generating audio: {str(e)}")
-        
+        # Return a cached result when the same video was already analyzed with the same options
+        cache_key = await analysis_cache_key(video_url, options)
+        if cache_key is not None:
+            cached = get_cached_analysis(cache_key)
+            if cached is not None:
+                logger.info(f"Returning cached analysis for {video_url}")
+                return cached
+
+        checkpoint_key = cache_key or result_cache_key(video_url, None, result_options(options))
+
+        def resume(stage: str) -> Optional[Dict[str, Any]]:
+            return checkpoint_store.load(checkpoint_key, stage) if checkpoint_store is not None else None
+
+        def checkpoint(stage: str, value: Dict[str, Any]) -> None:
+            if checkpoint_store is not None:
+                checkpoint_store.save(checkpoint_key, stage, value)
+
+        timings = StageTimings()
+
+        # Process video directly from URL with frame skipping on the bounded executor
+        results = resume("video")
+        if results is None:
+            # Later stages are only resumed on top of the video stage they were computed from, which
+            # records the pose backend that ran, so outputs of different models are never mixed
+            if checkpoint_store is not None:
+                checkpoint_store.clear(checkpoint_key)
+            with timings.stage("video"):
+                results = await run_blocking(process_video_from_url, video_url, options, partial(emit, "progress"))
+            # Written off the event loop since it includes the encoded images
+            await asyncio.to_thread(checkpoint, "video", results)
+        emit("progress", {"frames_processed": results["frames_inferred"], "min_knee_angle": results["min_knee_angle"], "done": True})
+
+        async def upload_image() -> Tuple[str, Optional[str]]:
+            uploaded = resume("image_upload")
+            if uploaded is not None:
+                image_url, thumbnail_url = uploaded["image_url"], uploaded["thumbnail_url"]
+            else:
+                with timings.stage("image_upload"):
+                    image_url, thumbnail_url = await upload_result_images(results)
+                checkpoint("image_upload", {"image_url": image_url, "thumbnail_url": thumbnail_url})
+            emit("image", {"image_url": image_url, "thumbnail_url": thumbnail_url, "min_knee_angle": results["min_knee_angle"]})
+            return image_url, thumbnail_url
+
+        async def analyze_and_narrate() -> Tuple[Dict[str, Any], Dict[str, str], Optional[str]]:
+            # Get GPT-4 analysis
+            gpt4_results = resume("vision")
+            if gpt4_results is None:
+                with timings.stage("vision"):
+                    vision_image = results["vision_image"]
+                    gpt4_results = await analyze_with_gpt4(
+                        vision_image.base64, results["min_knee_angle"], results["snapshot_frames"], vision_image.content_type
+                    )
+                # A fallback is not kept, so a retry asks the vision model again
+                if not gpt4_results["is_fallback"]:
+                    checkpoint("vision", gpt4_results)
+
+            # Log the analysis text for debugging
+            logger.info(f"Analysis text received: {gpt4_results['text_analysis'][:100]}...")
+
+            # Parse the GPT-4 response
+            parsed_sections = parse_gpt4_response(gpt4_results["text_analysis"])
+            emit("analysis", {"text_analysis": gpt4_results["text_analysis"], **parsed_sections})
+
+            # Generate audio from summary
+            logger.info("Generating audio from summary")
+            audio_url = None
+            narrated = resume("audio")
+            if narrated is not None and narrated["text"] == parsed_sections["summary"]:
+                audio_url = narrated["audio_url"]
+            else:
+                with timings.stage("audio"):
+                    try:
+                        audio_url = await generate_audio_from_text(parsed_sections["summary"])
+                    except Exception as e:
+                        logger.error(f"Error generating audio: {str(e)}")
+                if audio_url is not None:
+                    checkpoint("audio", {"text": parsed_sections["summary"], "audio_url": audio_url})
+            emit("audio", {"audio_url": audio_url})
+            return gpt4_results, parsed_sections, audio_url
+
+        # The image upload does not depend on the vision/TTS chain, so run them concurrently
+        (image_url, thumbnail_url), (gpt4_results, parsed_sections, audio_url) = await asyncio.gather(
+            upload_image(), analyze_and_narrate()
+        )
+
+        stage_timings = timings.as_dict()
+        REQUEST_SECONDS.observe(stage_timings["total"])
+        logger.info(f"Stage timings: {stage_timings}")
+
         # Combine all results
-        return {
-            "image_url": results["image_url"],
-            "min_knee_angle": results["min_knee_angle"],
-            "text_analysis": analysis_text,
-            "summary": parsed_sections["summary"],
-            "improvements": parsed_sections["improvements"],
-            "risk_factor": parsed_sections["risk_factor"],
-            "audio_url": audio_url
-        }
+        analysis = combine_analysis(
+            results, image_url, thumbnail_url, gpt4_results, parsed_sections, audio_url, stage_timings
+        )
+
+        # Don't cache fallback analyses so a transient OpenAI error is retried next time
+        if not gpt4_results["is_fallback"]:
+            if cache_key is not None:
+                set_cached_analysis(cache_key, analysis)
+            # Complete, so a later request starts over (or hits the result cache) instead of resuming
+            if checkpoint_store is not None:
+                checkpoint_store.clear(checkpoint_key)
+
+        return analysis
             
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in analyze_exercise: {str(e)}")
         # Include more context in the error message
         error_message = f"An error occurred during video analysis: {str(e)}"
         raise HTTPException(status_code=500, detail=error_message)
 
+async def process_and_analyze_batch(
+    video_urls: List[str],
+    options: Optional[AnalysisOptions] = None
+) -> Dict[str, Any]:
+    """
+    Analyze the videos of one session and return per-video results, in request order, plus a session summary.
+    Videos go through pose inference concurrently, up to the number of loaded pose models, and their vision
+    images are analyzed in combined requests of up to BATCH_VISION_MAX_IMAGES, each sent as soon as enough
+    videos are ready. One final request assesses the session from all per-video analyses.
+    A failing video is reported in its entry and does not fail the batch.
+    """
+    options = options or AnalysisOptions()
+    start = time.perf_counter()
+    urls = list(dict.fromkeys(video_urls))
+    # Running more videos at once than there are loaded models would only wait for a free model
+    semaphore = asyncio.Semaphore(config.BATCH_CONCURRENCY or model_pool.size)
+    vision_requests = 0
+
+    async def analyze_chunk(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        nonlocal vision_requests
+        analyses, requests_made = await analyze_batch_with_fallback(items)
+        vision_requests += requests_made
+        return analyses
+
+    batcher = RequestBatcher(analyze_chunk, len(urls), config.BATCH_VISION_MAX_IMAGES)
+
+    async def analyze(video_url: str) -> Dict[str, Any]:
+        submitted = False
+        try:
+            cache_key = await analysis_cache_key(video_url, options)
+            if cache_key is not None:
+                cached = get_cached_analysis(cache_key)
+                if cached is not None:
+                    logger.info(f"Returning cached analysis for {video_url}")
+                    return cached
+
+            timings = StageTimings()
+            async with semaphore:
+                with timings.stage("video"):
+                    results = await run_blocking(process_video_from_url, video_url, options)
+
+            vision = batcher.submit(results)
+            submitted = True
+
+            async def upload_image() -> Tuple[str, Optional[str]]:
+                with timings.stage("image_upload"):
+                    return await upload_result_images(results)
+
+            async def narrate() -> Tuple[Dict[str, Any], Dict[str, str], Optional[str]]:
+                with timings.stage("vision"):
+                    gpt4_results = await vision
+                parsed_sections = parse_gpt4_response(gpt4_results["text_analysis"])
+                with timings.stage("audio"):
+                    audio_url = await generate_audio_from_text(parsed_sections["summary"])
+                return gpt4_results, parsed_sections, audio_url
+
+            (image_url, thumbnail_url), (gpt4_results, parsed_sections, audio_url) = await asyncio.gather(
+                upload_image(), narrate()
+            )
+            stage_timings = timings.as_dict()
+            REQUEST_SECONDS.observe(stage_timings["total"])
+
+            analysis = combine_analysis(
+                results, image_url, thumbnail_url, gpt4_results, parsed_sections, audio_url, stage_timings
+            )
+            if cache_key is not None and not gpt4_results["is_fallback"]:
+                set_cached_analysis(cache_key, analysis)
+            return analysis
+        finally:
+            # Let the batcher send a partial chunk instead of waiting for this video
+            if not submitted:
+                batcher.skip()
+
+    async def analyze_entry(video_url: str) -> Dict[str, Any]:
+        try:
+            return {"video_url": video_url, "status_code": 200, "result": await analyze(video_url), "error": None}
+        except HTTPException as e:
+            status_code, error = e.status_code, str(e.detail)
+        except ValueError as e:
+            status_code, error = 400, str(e)
+        except Exception as e:
+            logger.error(f"Error analyzing {video_url} in batch: {str(e)}")
+            status_code, error = 500, f"An error occurred during video analysis: {str(e)}"
+        return {"video_url": video_url, "status_code": status_code, "result": None, "error": error}
+
+    entries = dict(zip(urls, await asyncio.gather(*(analyze_entry(url) for url in urls))))
+
+    analyzed = [entry["result"] for entry in entries.values() if entry["result"] is not None]
+    min_angles = [result["min_knee_angle"] for result in analyzed]
+    # One assessment over every video, rather than one per combined vision request
+    session_analysis = await summarize_session(analyzed) if analyzed else None
+    summary = {
+        "video_count": len(urls),
+        "succeeded": len(analyzed),
+        "failed": len(urls) - len(analyzed),
+        "total_reps": sum((result.get("rep_analysis") or {}).get("rep_count", 0) for result in analyzed),
+        "min_knee_angle": min(min_angles) if min_angles else None,
+        "mean_min_knee_angle": round(sum(min_angles) / len(min_angles), 2) if min_angles else None,
+        "session_analysis": session_analysis,
+        "vision_requests": vision_requests + (1 if analyzed else 0),
+        "wall_seconds": round(time.perf_counter() - start, 4),
+    }
+    logger.info(f"Batch of {len(urls)} videos finished: {summary['succeeded']} analyzed in {summary['wall_seconds']}s")
+    return {"results": [entries[url] for url in video_urls], "summary": summary}
+
 # ================ API ENDPOINTS ================
 
 @app.get("/")
@@ -510,7 +1127,8 @@ async def root(request: Request):
         "message": "Exercise Analysis API",
         "usage": {
             "GET /analyze": f"Use with query parameter: {base_url}/analyze?video_url=https://your-supabase-url.com/storage/v1/object/public/exercise-demo/video.mp4",
-            "POST /analyze": "Send a JSON body with video_url: {'video_url': 'https://your-supabase-url.com/storage/v1/object/public/exercise-demo/video.mp4'}"
+            "POST /analyze": "Send a JSON body with video_url: {'video_url': 'https://your-supabase-url.com/storage/v1/object/public/exercise-demo/video.mp4'}",
+            "POST /analyze/batch": "Send a JSON body with the videos of one session: {'video_urls': ['https://.../set1.mp4', 'https://.../set2.mp4']}"
         },
         "documentation": f"{base_url}/docs",
         "json_format_example": {
@@ -524,8 +1142,8 @@ async def root(request: Request):
 async def get_image(filename: str):
     """Redirect to the image in Supabase storage."""
     try:
-        # Get the public URL from Supabase
-        public_url = supabase.storage.from_(config.SUPABASE_BUCKET).get_public_url(filename)
+        # Build the public URL locally, no request to Supabase needed
+        public_url = storage.public_url(filename)
         return RedirectResponse(url=public_url)
     except Exception as e:
         logger.error(f"Error getting image URL: {str(e)}")
@@ -535,8 +1153,8 @@ async def get_image(filename: str):
 async def get_audio(filename: str):
     """Redirect to the audio file in Supabase storage."""
     try:
-        # Get the public URL from Supabase
-        public_url = supabase.storage.from_(config.SUPABASE_BUCKET).get_public_url(filename)
+        # Build the public URL locally, no request to Supabase needed
+        public_url = storage.public_url(filename)
         return RedirectResponse(url=public_url)
     except Exception as e:
         logger.error(f"Error getting audio URL: {str(e)}")
@@ -546,7 +1164,7 @@ async def get_audio(filename: str):
 async def analyze_exercise_get(
     request: Request, 
     video_url: Optional[str] = None, 
-    frame_skip: int = Query(config.DEFAULT_FRAME_SKIP, ge=config.MIN_FRAME_SKIP, le=config.MAX_FRAME_SKIP)
+    options: AnalysisOptions = Depends(get_analysis_options)
 ):
     """GET version of the analyze endpoint for easier testing via browser."""
     # Check if video_url is provided
@@ -563,21 +1181,134 @@ async def analyze_exercise_get(
         )
     
     # Process and analyze the video
-    results = await process_and_analyze_video(video_url, frame_skip)
+    results = await process_and_analyze_video(video_url, options)
     
     return JSONResponse(content=results)
 
+@app.get("/analyze/stream")
+async def analyze_exercise_stream(
+    video_url: str,
+    options: AnalysisOptions = Depends(get_analysis_options)
+):
+    """
+    Server-sent events version of the analyze endpoint.
+    Emits progress, image, analysis and audio events as each stage finishes, then a final result or error event.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def on_event(name: str, data: Dict[str, Any]) -> None:
+        # Progress events come from the executor thread, so hand them to the event loop safely
+        loop.call_soon_threadsafe(events.put_nowait, (name, data))
+
+    async def run() -> None:
+        try:
+            results = await process_and_analyze_video(video_url, options, on_event)
+            on_event("result", results)
+        except HTTPException as e:
+            on_event("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            on_event("error", {"status_code": 500, "detail": str(e)})
+
+    async def event_stream():
+        task = asyncio.create_task(run())
+        while True:
+            name, data = await events.get()
+            yield f"event: {name}\ndata: {json.dumps(data)}\n\n"
+            if name in ("result", "error"):
+                break
+        await task
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/analyze", response_model=AnalysisResponse)
 async def analyze_exercise(
     request: VideoRequest, 
-    frame_skip: int = Query(config.DEFAULT_FRAME_SKIP, ge=config.MIN_FRAME_SKIP, le=config.MAX_FRAME_SKIP)
+    options: AnalysisOptions = Depends(get_analysis_options)
 ):
     """Analyze exercise video and return the frame with the lowest knee angle, along with GPT-4 analysis."""
     # Process and analyze the video
-    results = await process_and_analyze_video(request.video_url, frame_skip)
+    results = await process_and_analyze_video(request.video_url, options)
     
     return JSONResponse(content=results)
 
+@app.post("/analyze/batch", response_model=BatchResponse)
+async def analyze_exercise_batch(
+    request: BatchRequest,
+    options: AnalysisOptions = Depends(get_analysis_options)
+):
+    """Analyze all videos of a session in one request, sharing the pose models and combining the vision requests."""
+    results = await process_and_analyze_batch(request.video_urls, options)
+
+    return JSONResponse(content=results)
+
+@app.post("/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    request: VideoRequest,
+    options: AnalysisOptions = Depends(get_analysis_options)
+):
+    """Queue a video analysis and return its job id immediately."""
+    job = job_manager.submit(partial(process_and_analyze_video, request.video_url, options))
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.to_dict())
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Return the status of an analysis job, and its result once completed."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JSONResponse(content=job.to_dict())
+
+registry.register(Gauge("job_queue_depth", "Jobs waiting for a free analysis slot", lambda: job_manager.queued))
+registry.register(Gauge("jobs_pending", "Jobs queued or running", lambda: job_manager.pending))
+registry.register(Gauge("model_pool_size", "Pose model instances in the pool", lambda: model_pool.size))
+registry.register(Gauge("model_pool_available", "Idle pose model instances", lambda: model_pool.stats()["available"]))
+registry.register(Gauge("model_pool_wait_seconds_total", "Total time spent waiting for a pose model", lambda: model_pool.stats()["wait_seconds_total"]))
+registry.register(Gauge("analyses_in_flight", "Distinct analyses running, after coalescing identical requests", lambda: analysis_flights.in_flight))
+registry.register(Gauge("analyses_coalesced_total", "Requests that attached to an analysis already in progress", lambda: analysis_flights.joined))
+registry.register(Gauge("startup_import_seconds", "Seconds spent importing the service", lambda: startup_state.import_seconds or 0))
+registry.register(Gauge("startup_ready_seconds", "Seconds from start until the pose models were warm", lambda: startup_state.ready_seconds or 0))
+registry.register(Gauge("ready", "1 once the pose models are warm", lambda: int(startup_state.status == "ready")))
+registry.register(Gauge("inference_workers_alive", "Running pose inference processes", lambda: inference_pool.stats()["alive"]))
+registry.register(Gauge("inference_slots_in_use", "Frames in flight in the inference process pool", lambda: inference_pool.stats()["slots_in_use"]))
+
+@app.get("/metrics")
+async def get_metrics():
+    """Expose latency histograms, frame counters and queue gauges in the Prometheus text format."""
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness probe: answers as soon as the process serves requests and does no other work."""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """
+    Readiness probe: 200 once the pose models are loaded and warm and the inference processes (if any)
+    are running, 503 while warming or after a failed warmup.
+    """
+    pools = startup_pools()
+    content = {
+        **startup_state.as_dict(),
+        "models_loaded": all(pool.loaded for pool in pools),
+        "models_warm": all(pool.warm for pool in pools),
+        "inference_pool_started": inference_pool.ready
+    }
+    ready = startup_state.status == "ready" and inference_pool.ready
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+@app.get("/metrics/pool")
+async def get_pool_metrics():
+    """Return model pool size and checkout wait-time metrics, per-backend pools and inference process pool usage."""
+    return {**model_pool.stats(), "pose_backends": pose_backends.stats(), "inference_pool": inference_pool.stats()}
+
+startup_state.mark_imported()
+
 # ================ MAIN ================
 
 if __name__ == "__main__":
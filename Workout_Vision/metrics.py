@@ -0,0 +1,133 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Buckets in seconds, from sub-millisecond frame decodes to long OpenAI calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values: Dict[Tuple[Tuple[str, str], ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in self._values.items():
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose value is set directly or read from a callback at scrape time."""
+
+    def __init__(self, name: str, documentation: str, callback: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def render(self) -> List[str]:
+        value = self.callback() if self.callback is not None else self._value
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge", f"{self.name} {value}"]
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[Tuple[str, str], ...], Dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.setdefault(key, {"buckets": [0] * len(self.buckets), "count": 0, "sum": 0.0})
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series["buckets"][index] += 1
+            series["count"] += 1
+            series["sum"] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def totals(self) -> Tuple[int, float]:
+        """Return the observation count and sum across all label sets."""
+        with self._lock:
+            return (
+                sum(series["count"] for series in self._series.values()),
+                sum(series["sum"] for series in self._series.values()),
+            )
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in self._series.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', str(bound)))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {series['count']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+VIDEO_OPEN_SECONDS = registry.register(Histogram("video_open_seconds", "Time to open a video capture"))
+FRAME_DECODE_SECONDS = registry.register(Histogram("frame_decode_seconds", "Time to decode one sampled frame"))
+FRAME_INFERENCE_SECONDS = registry.register(Histogram("frame_inference_seconds", "Pose inference time per frame"))
+IMAGE_ENCODE_SECONDS = registry.register(Histogram("image_encode_seconds", "Time to encode the analyzed frame"))
+UPLOAD_SECONDS = registry.register(Histogram("storage_upload_seconds", "Time per Supabase storage upload"))
+VISION_SECONDS = registry.register(Histogram("openai_vision_seconds", "OpenAI vision request latency"))
+TTS_SECONDS = registry.register(Histogram("openai_tts_seconds", "OpenAI text-to-speech request latency"))
+REQUEST_SECONDS = registry.register(Histogram("analysis_seconds", "End-to-end analysis latency"))
+PIPELINE_WAIT_SECONDS = registry.register(Histogram("pipeline_wait_seconds", "Time a pipeline stage waited for the stage before it"))
+
+FRAMES_DECODED = registry.register(Counter("frames_decoded_total", "Frames decoded from videos"))
+FRAMES_INFERRED = registry.register(Counter("frames_inferred_total", "Frames run through the pose model"))
+OPENAI_CACHE_LOOKUPS = registry.register(Counter("openai_cache_lookups_total", "Vision and TTS cache lookups by result"))
@@ -0,0 +1,176 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Any, Iterator, Optional
+
+from fastapi import HTTPException
+
+import config
+
+if TYPE_CHECKING:
+    from ultralytics import solutions
+
+logger = logging.getLogger(__name__)
+
+
+def create_ai_gym(model: str = config.POSE_MODEL) -> "solutions.AIGym":
+    """Create an AIGym instance with the given pose model weights, ONNX file or OpenVINO directory."""
+    # Imported here so importing the service does not pull in ultralytics and torch
+    from ultralytics import solutions
+
+    ai_gym = solutions.AIGym(
+        show=False,
+        kpts=config.POSE_KEYPOINTS,
+        model=model,
+        line_width=config.POSE_LINE_WIDTH,
+        verbose=False,
+    )
+    # Lets the inference process pool tell whether it runs the same model
+    ai_gym.model_path = model
+    return ai_gym
+
+
+def reset_ai_gym(ai_gym: "solutions.AIGym") -> None:
+    """Clear per-video state so the next video starts from a clean tracker."""
+    ai_gym.count = []
+    ai_gym.angle = []
+    ai_gym.stage = []
+
+    # model.track(persist=True) keeps its trackers on the predictor between calls
+    predictor = getattr(ai_gym.model, "predictor", None)
+    for tracker in getattr(predictor, "trackers", None) or []:
+        tracker.reset()
+
+
+class ModelPool:
+    """Fixed-size pool of pre-loaded AIGym instances shared by all requests of a worker."""
+
+    def __init__(
+        self,
+        size: int = config.POSE_MODEL_POOL_SIZE,
+        timeout: float = config.POSE_MODEL_POOL_TIMEOUT,
+        model: str = config.POSE_MODEL,
+    ):
+        self.size = size
+        self.model = model
+        self.timeout = timeout
+        self._instances: "queue.Queue[solutions.AIGym]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        self._in_use = 0
+        self._checkouts = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self.load_seconds = 0.0
+        self.warm = False
+        self.warmup_seconds = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> None:
+        """Load all model instances. Called from the application lifespan, or on first checkout."""
+        with self._load_lock:
+            if self._loaded:
+                return
+            start = time.perf_counter()
+            for i in range(self.size):
+                logger.info(f"Loading pose model {self.model} ({i + 1}/{self.size})")
+                self._instances.put(create_ai_gym(self.model))
+            self.load_seconds = time.perf_counter() - start
+            self._loaded = True
+        logger.info(f"Model pool for {self.model} ready with {self.size} instance(s) in {self.load_seconds:.2f}s")
+
+    def warm_up(self, warm: Callable[["solutions.AIGym"], None]) -> None:
+        """Load the pool if needed and call `warm` once on every instance, holding all of them meanwhile."""
+        self.load()
+        start = time.perf_counter()
+        instances = [self._instances.get(timeout=self.timeout) for _ in range(self.size)]
+        try:
+            for ai_gym in instances:
+                warm(ai_gym)
+                reset_ai_gym(ai_gym)
+        finally:
+            for ai_gym in instances:
+                self._instances.put(ai_gym)
+        self.warmup_seconds = time.perf_counter() - start
+        self.warm = True
+        logger.info(f"Model pool for {self.model} warmed up in {self.warmup_seconds:.2f}s")
+
+    def close(self) -> None:
+        """Drop all model instances."""
+        while not self._instances.empty():
+            self._instances.get_nowait()
+        self._loaded = False
+        self.warm = False
+
+    @contextmanager
+    def _borrow(self, ai_gym: "solutions.AIGym", waited: float) -> Iterator["solutions.AIGym"]:
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+
+        reset_ai_gym(ai_gym)
+        try:
+            yield ai_gym
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._instances.put(ai_gym)
+
+    @contextmanager
+    def checkout(self) -> Iterator["solutions.AIGym"]:
+        """Borrow a model instance for the duration of one video."""
+        if not self._loaded:
+            self.load()
+
+        start = time.perf_counter()
+        try:
+            ai_gym = self._instances.get(timeout=self.timeout)
+        except queue.Empty:
+            raise HTTPException(status_code=503, detail="No pose model available, please retry later")
+
+        with self._borrow(ai_gym, time.perf_counter() - start) as borrowed:
+            yield borrowed
+
+    @contextmanager
+    def try_checkout(self) -> Iterator[Optional["solutions.AIGym"]]:
+        """Borrow a model instance if one is idle right now, otherwise yield None."""
+        if not self._loaded:
+            self.load()
+
+        try:
+            ai_gym = self._instances.get_nowait()
+        except queue.Empty:
+            yield None
+            return
+
+        with self._borrow(ai_gym, 0.0) as borrowed:
+            yield borrowed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size and checkout wait-time metrics."""
+        with self._lock:
+            checkouts = self._checkouts
+            return {
+                "model": self.model,
+                "size": self.size,
+                "available": self._instances.qsize(),
+                "in_use": self._in_use,
+                "checkouts": checkouts,
+                "wait_seconds_total": round(self._wait_seconds_total, 6),
+                "wait_seconds_avg": round(self._wait_seconds_total / checkouts, 6) if checkouts else 0.0,
+                "wait_seconds_max": round(self._wait_seconds_max, 6),
+                "load_seconds": round(self.load_seconds, 6),
+                "warm": self.warm,
+                "warmup_seconds": round(self.warmup_seconds, 6),
+            }
+
+
+model_pool = ModelPool()
@@ -0,0 +1,82 @@
+import logging
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+import config
+from metrics import PIPELINE_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetch(iterable: Iterable[T], maxsize: int = config.PIPELINE_QUEUE_SIZE, name: str = "stage") -> Iterator[T]:
+    """
+    Run an iterable on its own thread and yield its items through a bounded queue.
+
+    The producer blocks once `maxsize` items are waiting, so memory stays flat however far it
+    could run ahead. Exceptions are re-raised in the consumer. Closing the returned generator
+    stops the producer, closes the source iterator on the producer thread and waits for it,
+    so resources the source uses (e.g. a VideoCapture) are free to release afterwards.
+    Stages compose: prefetch(monitor_frames(gym, prefetch(sample_frames(...)))).
+    A maxsize of 0 or less returns the iterable unchanged.
+    """
+    if maxsize <= 0:
+        yield from iterable
+        return
+
+    items: "queue.Queue" = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put(item):
+                    break
+            else:
+                put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name=f"pipeline-{name}", daemon=True)
+    thread.start()
+    try:
+        while True:
+            with PIPELINE_WAIT_SECONDS.time(stage=name):
+                item = items.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        # Unblock a producer waiting on a full queue, then wait for it to release its source
+        while thread.is_alive():
+            try:
+                items.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        thread.join()
@@ -0,0 +1,250 @@
+import logging
+import time
+from collections import deque
+from functools import partial
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+import config
+from metrics import FRAME_INFERENCE_SECONDS, FRAMES_INFERRED
+from joint_angles import joint_angle_engine
+from inference_pool import inference_pool
+
+logger = logging.getLogger(__name__)
+
+# COCO pose models predict 17 keypoints of (x, y, confidence)
+NO_KEYPOINTS = np.empty((0, 17, 3), dtype=np.float32)
+
+# Events ultralytics' register_tracker hooks into once a model has called track()
+TRACKER_EVENTS = ("on_predict_start", "on_predict_postprocess_end")
+
+
+class PoseFrame(NamedTuple):
+    frame_index: int
+    frame: np.ndarray
+    knee_angle: float
+    joint_angles: np.ndarray  # (people, joints), columns follow joint_angle_engine.joints
+    keypoints: np.ndarray  # (people, 17, 3)
+
+
+def empty_joint_angles() -> np.ndarray:
+    return np.empty((0, len(joint_angle_engine.joints)), dtype=np.float32)
+
+
+def keypoints_to_numpy(result) -> np.ndarray:
+    """Move a result's keypoint tensor to NumPy with a single device sync, in AIGym's reversed person order."""
+    return result.keypoints.data.cpu().numpy()[::-1]
+
+
+def create_annotator(frame: np.ndarray, line_width: int):
+    """Create an ultralytics Annotator, importing ultralytics only once drawing is needed."""
+    from ultralytics.utils.plotting import Annotator
+
+    return Annotator(frame, line_width=line_width)
+
+
+def annotate_keypoints(ai_gym, annotator, frame: np.ndarray, k: np.ndarray) -> None:
+    """Draw the configured keypoints of one person and the white lines connecting them."""
+    import cv2
+
+    annotator.draw_specific_points(k, ai_gym.kpts, radius=ai_gym.line_width * 2)
+
+    # Manually draw white lines connecting the keypoints
+    points = k[np.asarray(ai_gym.kpts, dtype=np.intp), :2].astype(int)
+    for pt1, pt2 in zip(points[:-1], points[1:]):
+        cv2.line(frame, tuple(pt1), tuple(pt2), (255, 255, 255), thickness=ai_gym.line_width)
+
+
+def annotate_frame(ai_gym, frame: np.ndarray, keypoints: np.ndarray) -> np.ndarray:
+    """Draw every person's keypoints on a frame, in place, and return it."""
+    annotator = create_annotator(frame, ai_gym.line_width)
+    for k in keypoints:
+        annotate_keypoints(ai_gym, annotator, frame, k)
+    return frame
+
+
+def uses_inference_pool(ai_gym, frame: np.ndarray) -> bool:
+    """
+    Whether the AIGym's frames are predicted by the inference processes, which only run POSE_MODEL
+    and only take frames that fit in a slot; larger frames (e.g. 4K) are predicted in this process.
+    """
+    return inference_pool.serves(getattr(ai_gym, "model_path", None)) and inference_pool.fits(frame)
+
+
+def predict_args(ai_gym) -> Dict[str, Any]:
+    """Model arguments for tracker-less prediction with the AIGym's configuration."""
+    args = {k: v for k, v in ai_gym.track_add_args.items() if k != "tracker"}
+    return {"classes": ai_gym.CFG["classes"], **args}
+
+
+def is_tracker_callback(callback) -> bool:
+    return isinstance(callback, partial) and getattr(callback.func, "__module__", "") == "ultralytics.trackers.track"
+
+
+def predict_untracked(ai_gym, source) -> list:
+    """
+    Predict without a tracker, even on an AIGym whose model has called track(): track() leaves
+    ByteTrack callbacks on the model that predict() would also run, feeding the frames to the
+    instance's tracker and dropping unconfirmed detections. They are removed for this call only;
+    the instance is checked out by the caller, so nothing else runs on it meanwhile.
+    """
+    callbacks = ai_gym.model.callbacks
+    saved = {event: callbacks.get(event, []) for event in TRACKER_EVENTS}
+    for event, registered in saved.items():
+        callbacks[event] = [callback for callback in registered if not is_tracker_callback(callback)]
+    try:
+        return ai_gym.model.predict(source=source, **predict_args(ai_gym))
+    finally:
+        callbacks.update(saved)
+
+
+def pose_output(
+    ai_gym, frame: np.ndarray, keypoints: Optional[np.ndarray], annotate: bool = True
+) -> Tuple[np.ndarray, float, np.ndarray, np.ndarray]:
+    """Turn predicted keypoints into the (frame, knee angle, joint angles, keypoints) tuple of custom_monitor."""
+    if keypoints is None or not len(keypoints):
+        return frame, 180, empty_joint_angles(), NO_KEYPOINTS
+
+    joint_angles = joint_angle_engine.compute(keypoints)
+    if annotate:
+        annotate_frame(ai_gym, frame, keypoints)
+    return frame, float(joint_angles[:, 0].min()), joint_angles, keypoints
+
+
+def custom_monitor(ai_gym, frame, annotate: bool = True) -> Tuple[np.ndarray, float, np.ndarray, np.ndarray]:
+    """
+    Process a frame with AIGym and return the processed frame, knee angle, joint angle matrix and keypoints.
+    The matrix has one row per tracked person and one column per joint in joint_angle_engine.joints.
+    With annotate=False nothing is drawn, so the frame can be annotated later from the returned keypoints.
+    When the inference process pool runs this AIGym's model, the frame is predicted there without a tracker.
+    """
+    if uses_inference_pool(ai_gym, frame):
+        with FRAME_INFERENCE_SECONDS.time():
+            keypoints = inference_pool.infer(frame, predict_args(ai_gym))
+        FRAMES_INFERRED.inc()
+        return pose_output(ai_gym, frame, keypoints, annotate)
+
+    with FRAME_INFERENCE_SECONDS.time():
+        tracks = ai_gym.model.track(source=frame, persist=True, classes=ai_gym.CFG["classes"], **ai_gym.track_add_args)[0]
+    FRAMES_INFERRED.inc()
+    min_knee_angle = None
+    joint_angles = empty_joint_angles()
+    keypoints = NO_KEYPOINTS
+
+    if tracks.boxes.id is not None:
+        if len(tracks) > len(ai_gym.count):
+            new_human = len(tracks) - len(ai_gym.count)
+            ai_gym.angle += [0] * new_human
+            ai_gym.count += [0] * new_human
+            ai_gym.stage += ["-"] * new_human
+
+        if annotate:
+            ai_gym.annotator = create_annotator(frame, ai_gym.line_width)
+
+        # All people and joints at once; column 0 is the configured knee angle
+        keypoints = keypoints_to_numpy(tracks)
+        joint_angles = joint_angle_engine.compute(keypoints)
+
+        for ind, k in enumerate(keypoints):
+            ai_gym.angle[ind] = float(joint_angles[ind, 0])
+
+            # Draw the keypoints and the lines connecting them
+            if annotate:
+                annotate_keypoints(ai_gym, ai_gym.annotator, frame, k)
+
+            if min_knee_angle is None or ai_gym.angle[ind] < min_knee_angle:
+                min_knee_angle = ai_gym.angle[ind]
+
+            if ai_gym.angle[ind] < config.DANGER_ANGLE_THRESHOLD:
+                ai_gym.stage[ind] = 'danger'
+                color = config.DANGER_COLOR
+            else:
+                ai_gym.stage[ind] = 'normal'
+                color = config.NORMAL_COLOR
+
+            # x, y = int(k[14][0]), int(k[14][1])
+            # cv2.circle(frame, (x + config.CIRCLE_OFFSET_X, y), config.CIRCLE_RADIUS, color, config.CIRCLE_THICKNESS)
+
+    return frame, (min_knee_angle if min_knee_angle is not None else 180), joint_angles, keypoints
+
+
+def custom_monitor_batch(
+    ai_gym, frames: List[np.ndarray], annotate: bool = True
+) -> List[Tuple[np.ndarray, float, np.ndarray, np.ndarray]]:
+    """
+    Run pose prediction on a batch of frames in a single model call.
+    Returns the processed frame, knee angle, joint angle matrix and keypoints for each input frame, like custom_monitor.
+    """
+    # Tracking is inherently sequential, so the batched path predicts without a tracker
+    start = time.perf_counter()
+    results = predict_untracked(ai_gym, frames)
+    per_frame = (time.perf_counter() - start) / max(1, len(frames))
+    for _ in frames:
+        FRAME_INFERENCE_SECONDS.observe(per_frame)
+    FRAMES_INFERRED.inc(len(frames))
+
+    return [
+        pose_output(ai_gym, frame, keypoints_to_numpy(result) if len(result) else None, annotate)
+        for frame, result in zip(frames, results)
+    ]
+
+
+def monitor_frames_pooled(
+    ai_gym, frames: Iterable[Tuple[int, np.ndarray]], annotate: bool = True
+) -> Iterator[PoseFrame]:
+    """Keep up to the inference pool's capacity of frames in flight and yield their PoseFrames in order."""
+    args = predict_args(ai_gym)
+    pending = deque()
+
+    def collect() -> PoseFrame:
+        frame_index, frame, start, future = pending.popleft()
+        keypoints = future.result(timeout=inference_pool.timeout)
+        FRAME_INFERENCE_SECONDS.observe(time.perf_counter() - start)
+        FRAMES_INFERRED.inc()
+        return PoseFrame(frame_index, *pose_output(ai_gym, frame, keypoints, annotate))
+
+    for frame_index, frame in frames:
+        pending.append((frame_index, frame, time.perf_counter(), inference_pool.submit(frame, args)))
+        if len(pending) >= inference_pool.capacity:
+            yield collect()
+    while pending:
+        yield collect()
+
+
+def monitor_frames(
+    ai_gym,
+    frames: Iterable[Tuple[int, np.ndarray]],
+    batch_size: int = config.DEFAULT_BATCH_SIZE,
+    annotate: bool = True,
+) -> Iterator[PoseFrame]:
+    """
+    Yield a PoseFrame for every sampled frame.
+    A batch size of 1 uses the per-frame tracking path, larger sizes buffer frames and predict them together.
+    When the inference process pool runs this AIGym's model, frames are spread over its workers instead.
+    """
+    # Every frame of a video has the same size, so the first one decides where the video runs
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        return
+    frames = chain([first], frames)
+    if uses_inference_pool(ai_gym, first[1]):
+        yield from monitor_frames_pooled(ai_gym, frames, annotate)
+        return
+
+    if batch_size <= 1:
+        for frame_index, frame in frames:
+            yield PoseFrame(frame_index, *custom_monitor(ai_gym, frame, annotate))
+        return
+
+    frames = iter(frames)
+    while True:
+        batch = list(islice(frames, batch_size))
+        if not batch:
+            break
+        indices = [frame_index for frame_index, _ in batch]
+        processed = custom_monitor_batch(ai_gym, [frame for _, frame in batch], annotate)
+        for frame_index, output in zip(indices, processed):
+            yield PoseFrame(frame_index, *output)
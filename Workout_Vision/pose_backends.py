@@ -0,0 +1,136 @@
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+import config
+from model_pool import ModelPool, model_pool
+
+logger = logging.getLogger(__name__)
+
+AUTO_BACKEND = "auto"
+
+
+def model_runtime(model: str) -> str:
+    """Runtime ultralytics uses for a model: torch weights, an ONNX file or an OpenVINO export directory."""
+    if model.endswith(".onnx"):
+        return "onnx"
+    if model.rstrip("/").endswith("_openvino_model"):
+        return "openvino"
+    return "torch"
+
+
+@dataclass(frozen=True)
+class PoseBackend:
+    name: str
+    model: str
+
+    @property
+    def runtime(self) -> str:
+        return model_runtime(self.model)
+
+    @property
+    def available(self) -> bool:
+        """Torch weights are downloaded on first use, exported runtimes must exist locally."""
+        return self.runtime == "torch" or Path(self.model).exists()
+
+
+def parse_backends(spec: str) -> List[PoseBackend]:
+    """Parse 'name=model,name=model,...', ordered from most accurate to fastest."""
+    backends = []
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        name, _, model = entry.partition("=")
+        if not model:
+            raise ValueError(f"Invalid pose backend '{entry}', expected name=model")
+        backends.append(PoseBackend(name.strip(), model.strip()))
+    return backends
+
+
+class PoseBackendRegistry:
+    """
+    Named pose models, each with its own lazily loaded model pool.
+
+    Every backend goes through the same AIGym / YOLO interface, which runs .pt weights with torch,
+    .onnx files with onnxruntime and *_openvino_model directories with OpenVINO, so custom_monitor
+    and the batched and segmented paths work unchanged whichever backend a video gets.
+    """
+
+    def __init__(self, backends: List[PoseBackend], default_model: str = config.POSE_MODEL):
+        # POSE_MODEL always has a backend, it is what requests get unless they opt into another one or auto
+        if not any(backend.model == default_model for backend in backends):
+            backends = [PoseBackend("default", default_model)] + backends
+        self.backends: Dict[str, PoseBackend] = {backend.name: backend for backend in backends}
+        self.default = next(backend.name for backend in backends if backend.model == default_model)
+        self._pools: Dict[str, ModelPool] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.backends)
+
+    def enabled(self, default: str) -> List[str]:
+        """Backends requests get without naming one: every available backend under auto, else just the default."""
+        if default == AUTO_BACKEND:
+            return [name for name, backend in self.backends.items() if backend.available]
+        return [default]
+
+    def pool(self, name: str) -> ModelPool:
+        """Return the model pool of a backend, reusing the default pool for the default model."""
+        with self._lock:
+            if name not in self._pools:
+                backend = self.backends[name]
+                self._pools[name] = model_pool if backend.model == model_pool.model else ModelPool(model=backend.model)
+            return self._pools[name]
+
+    def select(self, requested: str, width: int, height: int, sampled_frames: int, queue_depth: int) -> str:
+        """
+        Pick a backend for one video. A named backend is used as is. For 'auto', start from the most
+        accurate available backend and move one step towards the fastest for each of: a high-resolution
+        video (decoding already costs more per frame), a long video, and a busy job queue.
+        """
+        if requested != AUTO_BACKEND:
+            if requested not in self.backends:
+                raise ValueError(f"Unknown pose backend '{requested}'. Must be one of: {', '.join(self.backends)}")
+            return requested
+
+        candidates = [backend.name for backend in self.backends.values() if backend.available]
+        if not candidates:
+            raise ValueError("No pose backend is available")
+        level = (
+            (max(width, height) >= config.POSE_AUTO_HIGH_RES)
+            + (sampled_frames > config.POSE_AUTO_LONG_SAMPLES)
+            + (queue_depth >= config.POSE_AUTO_BUSY_JOBS)
+        )
+        name = candidates[min(level, len(candidates) - 1)]
+        logger.info(
+            f"Selected pose backend {name} for {width}x{height}, {sampled_frames} samples, "
+            f"{queue_depth} pending job(s)"
+        )
+        return name
+
+    def close(self) -> None:
+        """Drop the model instances of every backend loaded so far."""
+        with self._lock:
+            for pool in self._pools.values():
+                pool.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return each backend's model, runtime, availability and pool statistics once loaded."""
+        return {
+            name: {
+                "model": backend.model,
+                "runtime": backend.runtime,
+                "available": backend.available,
+                "pool": self._pools[name].stats() if name in self._pools else None,
+            }
+            for name, backend in self.backends.items()
+        }
+
+
+pose_backends = PoseBackendRegistry(parse_backends(config.POSE_BACKENDS))
+
+# Backend used when a request does not name one; auto has to be opted into
+DEFAULT_BACKEND = config.DEFAULT_POSE_BACKEND or pose_backends.default
@@ -0,0 +1,107 @@
+import heapq
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class TopFrame(NamedTuple):
+    frame_index: int
+    knee_angle: float
+    keypoints: np.ndarray
+    frame: Optional[np.ndarray] = None
+
+
+class PoseTrack:
+    """
+    Compact, array-backed record of the per-frame measurements of one video.
+    Only frame indices and angles are kept for every frame; keypoints are kept for the
+    top-K lowest-angle frames so those frames can be re-fetched and annotated afterwards. The
+    frames passed to append() are referenced (not copied) for the top-K only, as a fallback for
+    sources that cannot seek back to them.
+    With min_separation > 0, top-K frames are at least that many frames apart, so they
+    come from distinct reps rather than neighbouring frames of the same rep.
+    """
+
+    def __init__(self, num_joints: int, top_k: int = 1, capacity: int = 256, min_separation: int = 0):
+        self.top_k = max(1, top_k)
+        self.min_separation = min_separation
+        self.size = 0
+        self.frame_indices = np.empty(capacity, dtype=np.int32)
+        self.knee_angles = np.empty(capacity, dtype=np.float32)
+        # Joint angles of the person with the lowest knee angle, NaN when nobody was detected
+        self.joint_angles = np.empty((capacity, num_joints), dtype=np.float32)
+        # Max-heap (by negated angle, latest frame first on ties) of the current top-K frames
+        self._top: List[Tuple[float, int, np.ndarray, Optional[np.ndarray]]] = []
+
+    def _grow(self) -> None:
+        capacity = len(self.frame_indices) * 2
+        self.frame_indices = np.resize(self.frame_indices, capacity)
+        self.knee_angles = np.resize(self.knee_angles, capacity)
+        self.joint_angles = np.resize(self.joint_angles, (capacity, self.joint_angles.shape[1]))
+
+    def append(
+        self,
+        frame_index: int,
+        knee_angle: float,
+        joint_angles: np.ndarray,
+        keypoints: np.ndarray,
+        frame: Optional[np.ndarray] = None,
+    ) -> None:
+        """Record one inferred frame. O(1) amortized, plus O(log K) for the top-K heap."""
+        if self.size == len(self.frame_indices):
+            self._grow()
+        self.frame_indices[self.size] = frame_index
+        self.knee_angles[self.size] = knee_angle
+        if len(joint_angles):
+            self.joint_angles[self.size] = joint_angles[int(np.argmin(joint_angles[:, 0]))]
+        else:
+            self.joint_angles[self.size] = np.nan
+        self.size += 1
+
+        entry = (-float(knee_angle), -int(frame_index), keypoints, frame)
+        if self.min_separation > 0:
+            # Non-maximum suppression: a candidate only competes with nearby frames it beats
+            nearby = [e for e in self._top if abs(-e[1] - frame_index) < self.min_separation]
+            if any(e[:2] > entry[:2] for e in nearby):
+                return
+            if nearby:
+                self._top = [e for e in self._top if not any(e is n for n in nearby)]
+                heapq.heapify(self._top)
+
+        if len(self._top) < self.top_k:
+            heapq.heappush(self._top, entry)
+        elif entry[:2] > self._top[0][:2]:
+            heapq.heapreplace(self._top, entry)
+
+    def top_frames(self) -> List[TopFrame]:
+        """Return the top-K frames, lowest knee angle first (earliest frame first on ties)."""
+        return [
+            TopFrame(-neg_index, -neg_angle, keypoints, frame)
+            for neg_angle, neg_index, keypoints, frame in sorted(self._top, key=lambda e: e[:2], reverse=True)
+        ]
+
+    def best(self) -> TopFrame:
+        return self.top_frames()[0]
+
+    def joint_angle_series(self, joints: Sequence[str]) -> Dict[str, List[Optional[float]]]:
+        """
+        Return each joint's angle per recorded frame, aligned with the frame indices, None where
+        nobody was detected. `joints` names the columns of the joint angle matrices, in order.
+        """
+        angles = np.round(self.joint_angles[:self.size], 1)
+        return {
+            joint: [None if np.isnan(angle) else float(angle) for angle in angles[:, column]]
+            for column, joint in enumerate(joints)
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.frame_indices[:self.size].nbytes
+            + self.knee_angles[:self.size].nbytes
+            + self.joint_angles[:self.size].nbytes
+            + sum(keypoints.nbytes for _, _, keypoints, _ in self._top)
+        )
+
+    def __len__(self) -> int:
+        return self.size
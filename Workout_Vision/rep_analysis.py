@@ -0,0 +1,117 @@
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+import config
+
+
+class RepSegmenter:
+    """
+    Incremental, O(n) rep segmentation over the knee-angle series of one video.
+
+    Angles are smoothed with an exponential moving average and a rep is counted each time the
+    smoothed angle goes from above REP_UP_ANGLE, below REP_DOWN_ANGLE, and back above REP_UP_ANGLE.
+    The smoothing has a time constant in seconds, so it lags the movement by the same amount whatever
+    the frame skip; the fixed per-sample `alpha` is only used when the frame rate is unknown.
+    Samples must arrive in frame order; out-of-order samples (e.g. adaptive refinement) are ignored.
+    """
+
+    def __init__(
+        self,
+        fps: float,
+        up_angle: float = config.REP_UP_ANGLE,
+        down_angle: float = config.REP_DOWN_ANGLE,
+        smoothing_seconds: float = config.REP_SMOOTHING_SECONDS,
+        alpha: float = config.REP_SMOOTHING_ALPHA,
+        capacity: int = 256,
+    ):
+        self.fps = fps if fps and fps > 0 else None
+        self.up_angle = up_angle
+        self.down_angle = down_angle
+        self.smoothing_seconds = smoothing_seconds
+        self.alpha = alpha
+        self.size = 0
+        self.frame_indices = np.empty(capacity, dtype=np.int32)
+        self.knee_angles = np.empty(capacity, dtype=np.float32)
+        self.smoothed_angles = np.empty(capacity, dtype=np.float32)
+        self.reps: List[Dict[str, Any]] = []
+        self._smoothed: Optional[float] = None
+        self._stage = "-"
+        self._last_up_frame: Optional[int] = None
+        self._rep: Optional[Dict[str, Any]] = None
+
+    def _grow(self) -> None:
+        capacity = len(self.frame_indices) * 2
+        self.frame_indices = np.resize(self.frame_indices, capacity)
+        self.knee_angles = np.resize(self.knee_angles, capacity)
+        self.smoothed_angles = np.resize(self.smoothed_angles, capacity)
+
+    def _seconds(self, frames: int) -> Optional[float]:
+        return round(frames / self.fps, 3) if self.fps else None
+
+    def _alpha(self, frames: int) -> float:
+        """Smoothing factor for a sample `frames` after the previous one."""
+        if not self.fps or self.smoothing_seconds <= 0:
+            return self.alpha
+        return 1 - math.exp(-(frames / self.fps) / self.smoothing_seconds)
+
+    def update(self, frame_index: int, knee_angle: float) -> None:
+        """Add one sample and advance the rep state machine."""
+        if self.size and frame_index <= self.frame_indices[self.size - 1]:
+            return
+        # 180 means nobody was detected, which would otherwise read as standing fully upright
+        if knee_angle >= 180:
+            return
+
+        if self._smoothed is None:
+            smoothed = knee_angle
+        else:
+            alpha = self._alpha(frame_index - int(self.frame_indices[self.size - 1]))
+            smoothed = alpha * knee_angle + (1 - alpha) * self._smoothed
+        self._smoothed = smoothed
+
+        if self.size == len(self.frame_indices):
+            self._grow()
+        self.frame_indices[self.size] = frame_index
+        self.knee_angles[self.size] = knee_angle
+        self.smoothed_angles[self.size] = smoothed
+        self.size += 1
+
+        if smoothed >= self.up_angle:
+            if self._stage == "down" and self._rep is not None:
+                self._finish_rep(frame_index)
+            self._stage = "up"
+            self._last_up_frame = frame_index
+        elif smoothed <= self.down_angle and self._stage == "up":
+            self._stage = "down"
+            self._rep = {"start_frame": self._last_up_frame, "bottom_frame": frame_index, "min_angle": knee_angle}
+
+        if self._stage == "down" and self._rep is not None and knee_angle < self._rep["min_angle"]:
+            self._rep["min_angle"] = knee_angle
+            self._rep["bottom_frame"] = frame_index
+
+    def _finish_rep(self, end_frame: int) -> None:
+        rep = self._rep
+        self._rep = None
+        self.reps.append({
+            "rep": len(self.reps) + 1,
+            "start_frame": int(rep["start_frame"]),
+            "bottom_frame": int(rep["bottom_frame"]),
+            "end_frame": int(end_frame),
+            "min_angle": round(float(rep["min_angle"]), 2),
+            "eccentric_seconds": self._seconds(rep["bottom_frame"] - rep["start_frame"]),
+            "concentric_seconds": self._seconds(end_frame - rep["bottom_frame"]),
+            "time_under_tension": self._seconds(end_frame - rep["start_frame"]),
+        })
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the rep count, per-rep depth and tempo, and the angle series."""
+        return {
+            "rep_count": len(self.reps),
+            "reps": self.reps,
+            "fps": self.fps,
+            "frame_indices": self.frame_indices[:self.size].tolist(),
+            "knee_angles": np.round(self.knee_angles[:self.size], 1).tolist(),
+            "smoothed_angles": np.round(self.smoothed_angles[:self.size], 1).tolist(),
+        }
@@ -0,0 +1,118 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import ExitStack
+from typing import Iterator, List, Tuple
+
+import config
+from frame_sampling import read_frame_range
+from model_pool import ModelPool, model_pool, reset_ai_gym
+from pose_analysis import PoseFrame, monitor_frames
+
+logger = logging.getLogger(__name__)
+
+
+def split_segments(total_frames: int, step: int, count: int) -> List[Tuple[int, int]]:
+    """
+    Split [0, total_frames) into up to `count` contiguous [start, stop) ranges.
+    Every boundary is a multiple of `step`, so the segments sample exactly the frames a linear pass would.
+    """
+    samples = -(-total_frames // step)
+    count = max(1, min(count, samples))
+    bounds = [round(i * samples / count) * step for i in range(count)] + [total_frames]
+    return [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if start < stop]
+
+
+def process_segment(
+    source: str,
+    ai_gym,
+    start: int,
+    stop: int,
+    step: int,
+    batch_size: int = config.DEFAULT_BATCH_SIZE,
+    warmup_samples: int = config.SEGMENT_WARMUP_SAMPLES,
+) -> List[PoseFrame]:
+    """
+    Run pose inference on every `step`th frame of [start, stop) with a capture of its own.
+
+    The tracker starts fresh, then sees `warmup_samples` samples from before `start` so it
+    already follows the person at the boundary, as it would in a linear pass. Results for the
+    warm-up samples are dropped, as are the frame pixels, which are re-read later if needed.
+    """
+    import cv2
+
+    reset_ai_gym(ai_gym)
+    cap = cv2.VideoCapture(source)
+    try:
+        if not cap.isOpened():
+            raise RuntimeError(f"Could not open video for segment {start}-{stop}")
+        first = max(0, start - warmup_samples * step)
+        frames = read_frame_range(cap, first, stop, step)
+        return [
+            pose_frame._replace(frame=None)
+            for pose_frame in monitor_frames(ai_gym, frames, batch_size, annotate=False)
+            if pose_frame.frame_index >= start
+        ]
+    finally:
+        cap.release()
+
+
+def segmented_frames(
+    source: str,
+    ai_gym,
+    total_frames: int,
+    step: int,
+    segments: int,
+    batch_size: int = config.DEFAULT_BATCH_SIZE,
+    pool: ModelPool = model_pool,
+) -> Iterator[PoseFrame]:
+    """
+    Process a video as parallel time segments and yield their PoseFrames in frame order.
+
+    Segments are handed out to one thread per model instance: `ai_gym` plus any instance that
+    is idle in `pool` right now, so a busy pool degrades to fewer threads instead of
+    waiting. Frames of the first segment are yielded as soon as it finishes, while later ones
+    are still running. PoseFrame.frame is None, the pixels are not kept.
+    """
+    ranges = split_segments(total_frames, step, segments)
+    results: List[Future] = [Future() for _ in ranges]
+    todo: "queue.Queue[int]" = queue.Queue()
+    for i in range(len(ranges)):
+        todo.put(i)
+
+    def work(gym) -> None:
+        while True:
+            try:
+                i = todo.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                results[i].set_result(process_segment(source, gym, *ranges[i], step, batch_size))
+            except BaseException as e:
+                results[i].set_exception(e)
+
+    with ExitStack() as models:
+        gyms = [ai_gym]
+        for _ in range(len(ranges) - 1):
+            gym = models.enter_context(pool.try_checkout())
+            if gym is None:
+                break
+            gyms.append(gym)
+        logger.info(f"Processing {len(ranges)} segment(s) with {len(gyms)} model instance(s)")
+
+        threads = [threading.Thread(target=work, args=(gym,), name=f"segment-{i}", daemon=True) for i, gym in enumerate(gyms)]
+        for thread in threads:
+            thread.start()
+        try:
+            for result in results:
+                yield from result.result()
+        finally:
+            # Start no new segments, and let running ones finish before their models are returned
+            while True:
+                try:
+                    todo.get_nowait()
+                except queue.Empty:
+                    break
+            for thread in threads:
+                thread.join()
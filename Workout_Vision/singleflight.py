@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EventListener = Callable[[str, Dict[str, Any]], None]
+
+
+class Flight:
+    """One in-progress computation and the listeners of every caller attached to it."""
+
+    def __init__(self):
+        self.listeners: List[EventListener] = []
+        self.callers = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def emit(self, name: str, data: Dict[str, Any]) -> None:
+        for listener in list(self.listeners):
+            listener(name, data)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one computation whose result (or error)
+    every caller receives. Callers that arrive while it runs get its events from then on.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, Flight] = {}
+        self.started = 0
+        self.joined = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def run(
+        self,
+        key: str,
+        func: Callable[[EventListener], Awaitable[Any]],
+        on_event: Optional[EventListener] = None
+    ) -> Any:
+        """Run func(emit) for the key, or attach to the computation already running for it."""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = Flight()
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(func(flight.emit))
+            flight.task.add_done_callback(lambda task: self._finish(key, flight, task))
+            self.started += 1
+        else:
+            self.joined += 1
+            logger.info(f"Joining in-flight computation {key[:12]} ({flight.callers} caller(s) already waiting)")
+
+        if on_event is not None:
+            flight.listeners.append(on_event)
+        flight.callers += 1
+        try:
+            # Shielded so a caller that disconnects does not cancel the work the others wait for
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.callers -= 1
+            if on_event is not None:
+                flight.listeners.remove(on_event)
+
+    def _finish(self, key: str, flight: Flight, task: asyncio.Task) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the error as retrieved in case every caller went away before it finished
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": self.in_flight, "started": self.started, "joined": self.joined}
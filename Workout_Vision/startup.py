@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+import config
+from inference_pool import inference_pool
+from model_pool import ModelPool
+
+logger = logging.getLogger(__name__)
+
+
+class StartupState:
+    """Startup phases and their timings, measured from when this module was first imported."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.status = "starting"
+        self.import_seconds: Optional[float] = None
+        self.serving_seconds: Optional[float] = None
+        self.ready_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def _elapsed(self) -> float:
+        return round(time.perf_counter() - self.started_at, 4)
+
+    def mark_imported(self) -> None:
+        self.import_seconds = self._elapsed()
+
+    def mark_serving(self) -> None:
+        self.serving_seconds = self._elapsed()
+        logger.info(f"Serving {self.serving_seconds:.2f}s after start ({self.import_seconds:.2f}s importing)")
+
+    def mark_ready(self) -> None:
+        self.status = "ready"
+        self.ready_seconds = self._elapsed()
+        logger.info(f"Ready {self.ready_seconds:.2f}s after start")
+
+    def mark_failed(self, error: Exception) -> None:
+        self.status = "failed"
+        self.error = str(error)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "import_seconds": self.import_seconds,
+            "serving_seconds": self.serving_seconds,
+            "ready_seconds": self.ready_seconds,
+            "error": self.error,
+        }
+
+
+startup_state = StartupState()
+
+
+def dummy_frame() -> np.ndarray:
+    return np.zeros((config.WARMUP_FRAME_HEIGHT, config.WARMUP_FRAME_WIDTH, 3), dtype=np.uint8)
+
+
+def warm_up_model(ai_gym) -> None:
+    """Run one dummy frame through custom_monitor so the first real request skips lazy init and allocations."""
+    from pose_analysis import custom_monitor
+
+    custom_monitor(ai_gym, dummy_frame(), annotate=True)
+
+
+def warm_up(pools: List[ModelPool]) -> None:
+    """Load and warm every instance of the given model pools, and every inference process if the pool is running."""
+    for pool in pools:
+        pool.warm_up(warm_up_model)
+    if inference_pool.started:
+        frame = dummy_frame()
+        for future in [inference_pool.submit(frame) for _ in range(inference_pool.capacity)]:
+            future.result(timeout=inference_pool.timeout)
+
+
+async def prepare(pools: List[ModelPool]) -> None:
+    """Warm the models off the event loop, so health probes are answered meanwhile, then mark the service ready."""
+    startup_state.status = "warming"
+    try:
+        await asyncio.to_thread(warm_up, pools)
+    except Exception as e:
+        logger.error(f"Warmup failed: {str(e)}")
+        startup_state.mark_failed(e)
+        return
+    startup_state.mark_ready()
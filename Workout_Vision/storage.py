@@ -0,0 +1,80 @@
+import logging
+from typing import Optional
+from urllib.parse import quote
+
+import httpx
+
+import config
+from http_clients import http_clients, with_retries
+from metrics import UPLOAD_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class SupabaseStorage:
+    """
+    Async uploads to a Supabase storage bucket over its REST API, on a shared keep-alive client.
+    Public URLs are built locally, so an upload is a single request.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = config.SUPABASE_URL,
+        key: Optional[str] = config.SUPABASE_KEY,
+        bucket: str = config.SUPABASE_BUCKET,
+        client: Optional[httpx.AsyncClient] = None,
+        retries: int = config.HTTP_RETRIES,
+    ):
+        self.url = (url or "").rstrip("/")
+        self.key = key
+        self.bucket = bucket
+        self.retries = retries
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client if self._client is not None else http_clients.async_client
+
+    @staticmethod
+    def is_duplicate(response: httpx.Response) -> bool:
+        """Whether the object already exists; older storage versions report it as a 400 with a 409 body."""
+        if response.status_code == 409:
+            return True
+        if response.status_code == 400:
+            try:
+                return str(response.json().get("statusCode")) == "409"
+            except ValueError:
+                return False
+        return False
+
+    def public_url(self, filename: str) -> str:
+        """Public URL of an object in the bucket, the same one get_public_url would return."""
+        return f"{self.url}/storage/v1/object/public/{self.bucket}/{quote(filename)}"
+
+    async def upload(self, data: bytes, filename: str, content_type: str) -> str:
+        """Upload bytes to the bucket and return the object's public URL."""
+        headers = {
+            "Authorization": f"Bearer {self.key}",
+            "apikey": self.key or "",
+            "Content-Type": content_type,
+        }
+
+        async def attempt() -> httpx.Response:
+            response = await self.client.post(
+                f"{self.url}/storage/v1/object/{self.bucket}/{quote(filename)}", content=data, headers=headers
+            )
+            # Plain inserts, like the SDK's default, so the bucket only needs an INSERT policy. Filenames are
+            # unique per analysis, so an existing object was stored by an earlier attempt (a timed-out retry
+            # or an analysis resumed from its checkpoint) and holds the same bytes
+            if self.is_duplicate(response):
+                logger.info(f"{filename} was stored by an earlier attempt")
+                return response
+            response.raise_for_status()
+            return response
+
+        with UPLOAD_SECONDS.time(content_type=content_type):
+            await with_retries(attempt, self.retries)
+        return self.public_url(filename)
+
+
+storage = SupabaseStorage()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Make the service modules importable when running `python -m pytest` from Workout_Vision or the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
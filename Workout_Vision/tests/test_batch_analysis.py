@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("fastapi")
+
+import main
+from image_utils import EncodedImage
+
+ANALYSIS = """1. [SUMMARY]: Good depth.
+2. [IMPROVEMENTS]: Keep the chest up.
+3. [RISK FACTOR]: Low."""
+
+
+class FakeCompletions:
+    """Answers chat completions with canned responses and records each request."""
+
+    def __init__(self, combined: str):
+        self.combined = combined
+        self.requests = []
+
+    async def create(self, model, messages, max_tokens):
+        self.requests.append(messages)
+        content = messages[0]["content"]
+        text = self.combined if len(content) > 2 else ANALYSIS
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    def install(combined: str) -> FakeCompletions:
+        fake = FakeCompletions(combined)
+        client = SimpleNamespace(chat=SimpleNamespace(completions=fake))
+        monkeypatch.setattr(main, "get_openai_client", lambda: client)
+        monkeypatch.setattr(main, "vision_cache", None)
+        return fake
+
+    return install
+
+
+def items(count: int):
+    return [
+        {
+            "vision_image": EncodedImage(bytes([i]), "jpeg", 8, 8),
+            "min_knee_angle": 80.0 + i,
+            "snapshot_frames": [{"frame_index": i, "knee_angle": 80.0 + i}],
+        }
+        for i in range(count)
+    ]
+
+
+def test_split_batch_response_assigns_sections_by_video_number():
+    text = "### VIDEO 2\nsecond\n**VIDEO 1:**\nfirst\n### VIDEO 7\nout of range"
+
+    assert main.split_batch_response(text, 3) == ["first", "second", None]
+
+
+def test_split_batch_response_ignores_video_mentions_in_the_text():
+    text = "### VIDEO 1\nBetter than in Video 2 of last week.\nVideo 2 below\n"
+
+    assert main.split_batch_response(text, 2) == ["Better than in Video 2 of last week.\nVideo 2 below", None]
+
+
+def test_combined_response_covering_every_video_makes_one_request(completions):
+    fake = completions("\n\n".join(f"### VIDEO {i + 1}\n{ANALYSIS}" for i in range(3)))
+
+    analyses, requests_made = asyncio.run(main.analyze_batch_with_fallback(items(3)))
+
+    assert requests_made == len(fake.requests) == 1
+    assert [analysis["text_analysis"] for analysis in analyses] == [ANALYSIS] * 3
+
+
+def test_videos_missing_from_a_malformed_response_are_analyzed_separately(completions):
+    # Video 2 has no section and video 3's section lacks the expected fields
+    fake = completions(f"### VIDEO 1\n{ANALYSIS}\n### VIDEO 3\nLooks fine.")
+
+    analyses, requests_made = asyncio.run(main.analyze_batch_with_fallback(items(3)))
+
+    assert requests_made == len(fake.requests) == 3
+    assert all(analysis["text_analysis"] == ANALYSIS and not analysis["is_fallback"] for analysis in analyses)
+    # The separate requests carry one image each
+    assert [len(request[0]["content"]) for request in fake.requests[1:]] == [2, 2]
+
+
+def test_unparseable_response_falls_back_for_every_video(completions):
+    fake = completions("Sorry, I cannot help with that.")
+
+    analyses, requests_made = asyncio.run(main.analyze_batch_with_fallback(items(2)))
+
+    assert requests_made == len(fake.requests) == 3
+    assert all(analysis is not None for analysis in analyses)
@@ -0,0 +1,52 @@
+import asyncio
+
+from batching import RequestBatcher
+
+
+def run_batcher(submissions, size, fail=False):
+    """Submit items (None means skip) from concurrent tasks and return their results and the processed chunks."""
+    chunks = []
+
+    async def process(items):
+        chunks.append(list(items))
+        await asyncio.sleep(0)
+        if fail:
+            raise RuntimeError("vision request failed")
+        return [item * 10 for item in items]
+
+    async def main():
+        batcher = RequestBatcher(process, len(submissions), size)
+
+        async def task(item):
+            if item is None:
+                batcher.skip()
+                return None
+            return await batcher.submit(item)
+
+        results = await asyncio.gather(*(task(item) for item in submissions), return_exceptions=True)
+        return results, batcher.chunks
+
+    results, count = asyncio.run(main())
+    assert count == len(chunks)
+    return results, chunks
+
+
+def test_items_are_grouped_into_chunks_of_size():
+    results, chunks = run_batcher([1, 2, 3, 4, 5], size=2)
+
+    assert results == [10, 20, 30, 40, 50]
+    assert chunks == [[1, 2], [3, 4], [5]]
+
+
+def test_skipped_tasks_release_a_partial_chunk():
+    results, chunks = run_batcher([1, None, 2, None], size=4)
+
+    assert results == [10, None, 20, None]
+    assert chunks == [[1, 2]]
+
+
+def test_errors_reach_every_item_of_the_chunk():
+    results, chunks = run_batcher([1, 2, 3], size=2, fail=True)
+
+    assert len(chunks) == 2
+    assert all(isinstance(result, RuntimeError) for result in results)
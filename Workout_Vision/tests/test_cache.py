@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from cache import MemoryCache, SQLiteCache, TieredCache, hash_key
+
+
+def test_memory_cache_evicts_the_least_recently_used_entry():
+    cache = MemoryCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_memory_cache_expires_entries():
+    cache = MemoryCache(max_entries=2, ttl=-1)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_is_created_lazily_and_persists_across_instances(tmp_path):
+    path = tmp_path / "data" / "cache.sqlite3"
+    first = SQLiteCache(str(path), table="results", ttl=60)
+    assert not path.exists()
+
+    first.set("key", {"min_knee_angle": 80.5, "reps": [1, 2]})
+    second = SQLiteCache(str(path), table="results", ttl=60)
+
+    assert path.exists()
+    assert second.get("key") == {"min_knee_angle": 80.5, "reps": [1, 2]}
+    assert SQLiteCache(str(path), table="tts", ttl=60).get("key") is None
+
+
+def test_sqlite_cache_drops_expired_entries(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), ttl=-1)
+    cache.set("key", "value")
+
+    assert cache.get("key") is None
+
+
+def test_tiered_cache_promotes_disk_hits_to_memory(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    SQLiteCache(path, ttl=60).set("key", "value")
+    cache = TieredCache(MemoryCache(max_entries=2, ttl=60), SQLiteCache(path, ttl=60))
+
+    assert cache.memory.get("key") is None
+    assert cache.get("key") == "value"
+    assert cache.memory.get("key") == "value"
+    assert cache.get("missing") is None
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_tiered_cache_writes_through_to_disk(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    TieredCache(MemoryCache(max_entries=2, ttl=60), SQLiteCache(path, ttl=60)).set("key", "value")
+
+    assert SQLiteCache(path, ttl=60).get("key") == "value"
+
+
+def test_hash_key_is_stable_and_order_insensitive_for_dicts():
+    assert hash_key("url", {"a": 1, "b": 2}) == hash_key("url", {"b": 2, "a": 1})
+    assert hash_key("url", {"a": 1}) != hash_key("url", {"a": 2})
@@ -0,0 +1,72 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import config
+from checkpoints import CheckpointStore
+from image_utils import EncodedImage
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(str(tmp_path / "data" / "checkpoints"), ttl=60)
+
+
+def test_directory_is_created_on_first_save(store):
+    assert not store.directory.exists()
+    assert store.prune() == 0
+    assert store.load("key", "video") is None
+
+    store.save("key", "video", {"min_knee_angle": 80.5})
+
+    assert store.directory.is_dir()
+
+
+def test_save_and_load_round_trip_with_images(store):
+    image = EncodedImage(b"\x89PNG fake", "png", 64, 48)
+    store.save("key", "video", {"min_knee_angle": 80.5, "snapshot_frames": [{"frame_index": 3}], "image": image})
+
+    loaded = store.load("key", "video")
+
+    assert loaded["min_knee_angle"] == 80.5
+    assert loaded["snapshot_frames"] == [{"frame_index": 3}]
+    assert isinstance(loaded["image"], EncodedImage)
+    assert (loaded["image"].data, loaded["image"].format) == (image.data, "png")
+    assert (loaded["image"].width, loaded["image"].height) == (64, 48)
+
+
+def test_checkpoints_are_per_key_and_stage(store):
+    store.save("key", "video", {"value": 1})
+
+    assert store.load("other-key", "video") is None
+    assert store.load("key", "vision") is None
+
+
+def test_expired_and_cleared_checkpoints_are_not_loaded(store):
+    store.save("expired", "video", {"value": 1})
+    store.save("cleared", "video", {"value": 2})
+    old = time.time() - 120
+    os.utime(store.directory / "expired" / "video.json", (old, old))
+    os.utime(store.directory / "expired", (old, old))
+
+    store.clear("cleared")
+
+    assert store.load("expired", "video") is None
+    assert store.load("cleared", "video") is None
+    assert store.prune() == 1
+    assert not (store.directory / "expired").exists()
+
+
+def test_unserializable_values_are_not_checkpointed(store):
+    store.save("key", "video", {"value": object()})
+
+    assert store.load("key", "video") is None
+
+
+@pytest.mark.skipif(bool(os.getenv("CHECKPOINT_DIR")), reason="CHECKPOINT_DIR is set in the environment")
+def test_default_directory_is_under_data_dir():
+    assert Path(config.CHECKPOINT_DIR) == Path(config.DATA_DIR) / "checkpoints"
@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("ultralytics")
+
+import numpy as np
+
+import pose_analysis
+from inference_pool import InferencePool
+from model_pool import create_ai_gym
+
+
+@pytest.fixture(scope="module")
+def ai_gym():
+    return create_ai_gym()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = InferencePool(workers=1, threads_per_worker=1, slots_per_worker=2, slot_bytes=640 * 480 * 3)
+    pool.start()
+    monkeypatch.setattr(pose_analysis, "inference_pool", pool)
+    yield pool
+    pool.close()
+
+
+def test_custom_monitor_runs_through_the_pool_with_aigym_arguments(ai_gym, pool):
+    args = pose_analysis.predict_args(ai_gym)
+    # The AIGym arguments include their own verbose flag, which the worker also sets
+    assert "verbose" in args
+
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    _, knee_angle, joint_angles, keypoints = pose_analysis.custom_monitor(ai_gym, frame, annotate=False)
+
+    assert knee_angle == 180
+    assert len(joint_angles) == len(keypoints) == 0
+    assert pool.stats()["frames"] == 1
+
+
+def test_monitor_frames_runs_through_the_pool(ai_gym, pool):
+    frames = [(i, np.zeros((480, 640, 3), dtype=np.uint8)) for i in range(5)]
+    results = list(pose_analysis.monitor_frames(ai_gym, frames, annotate=False))
+    assert [result.frame_index for result in results] == list(range(5))
+
+
+def test_other_models_are_not_routed_to_the_pool(ai_gym, pool):
+    assert pose_analysis.uses_inference_pool(ai_gym, np.zeros((480, 640, 3), dtype=np.uint8))
+    assert not pool.serves("yolo11n-pose-other.pt")
+
+
+def test_frames_larger_than_a_slot_run_in_process(ai_gym, pool):
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    assert not pool.fits(frame)
+    assert not pose_analysis.uses_inference_pool(ai_gym, frame)
+
+    _, knee_angle, _, _ = pose_analysis.custom_monitor(ai_gym, frame, annotate=False)
+    results = list(pose_analysis.monitor_frames(ai_gym, [(i, frame) for i in range(3)], annotate=False))
+
+    assert knee_angle == 180
+    assert [result.frame_index for result in results] == [0, 1, 2]
+    assert pool.stats()["frames"] == 0
@@ -0,0 +1,41 @@
+from functools import partial
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("ultralytics")
+
+import numpy as np
+
+import pose_analysis
+from model_pool import create_ai_gym
+
+
+@pytest.fixture(scope="module")
+def ai_gym():
+    return create_ai_gym()
+
+
+def test_batched_prediction_skips_the_tracker_callbacks_of_a_tracked_model(ai_gym):
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    # track() registers ByteTrack callbacks on the model
+    pose_analysis.custom_monitor(ai_gym, frame.copy(), annotate=False)
+    callbacks = ai_gym.model.callbacks["on_predict_postprocess_end"]
+    assert any(pose_analysis.is_tracker_callback(callback) for callback in callbacks)
+
+    calls = []
+
+    def tracker_callback(predictor, persist=False):
+        calls.append(predictor)
+
+    tracker_callback.__module__ = "ultralytics.trackers.track"
+    callbacks.append(partial(tracker_callback, persist=True))
+
+    results = pose_analysis.custom_monitor_batch(ai_gym, [frame.copy(), frame.copy()], annotate=False)
+
+    assert [knee_angle for _, knee_angle, _, _ in results] == [180, 180]
+    assert calls == []
+    # The tracker keeps working for the per-frame path afterwards
+    assert ai_gym.model.callbacks["on_predict_postprocess_end"][-1].func is tracker_callback
+    pose_analysis.custom_monitor(ai_gym, frame.copy(), annotate=False)
+    assert len(calls) == 1
@@ -0,0 +1,35 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pose_track import PoseTrack
+
+JOINTS = ["primary", "left_knee", "left_hip"]
+NO_KEYPOINTS = np.empty((0, 17, 3), dtype=np.float32)
+
+
+def test_joint_angle_series_follows_the_person_with_the_lowest_knee_angle():
+    track = PoseTrack(num_joints=len(JOINTS), capacity=1)
+    track.append(0, 170.0, np.array([[170.0, 171.0, 165.0]]), NO_KEYPOINTS)
+    track.append(5, 180.0, np.empty((0, len(JOINTS))), NO_KEYPOINTS)
+    # Two people: the second one squats deeper
+    track.append(10, 90.0, np.array([[120.0, 121.0, 110.0], [90.0, 91.0, 80.0]]), NO_KEYPOINTS)
+
+    series = track.joint_angle_series(JOINTS)
+
+    assert series["left_knee"] == [171.0, None, 91.0]
+    assert series["left_hip"] == [165.0, None, 80.0]
+    assert len(track) == 3
+
+
+def test_top_frames_keep_the_decoded_frame_for_sources_that_cannot_seek():
+    track = PoseTrack(num_joints=len(JOINTS), top_k=2)
+    frames = [np.full((2, 2, 3), i, dtype=np.uint8) for i in range(3)]
+    for i, (angle, frame) in enumerate(zip([150.0, 90.0, 120.0], frames)):
+        track.append(i, angle, np.array([[angle, angle, angle]]), NO_KEYPOINTS, frame)
+
+    top = track.top_frames()
+
+    assert [entry.frame_index for entry in top] == [1, 2]
+    assert top[0].frame is frames[1]
+    assert track.best().knee_angle == 90.0
@@ -0,0 +1,39 @@
+import math
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import config
+from rep_analysis import RepSegmenter
+
+FPS = 30.0
+
+
+def squat_angle(t: float, rep_seconds: float, reps: int, bottom: float) -> float:
+    """Knee angle of `reps` squats of `rep_seconds` each, standing at 170 degrees before and after."""
+    if t < 0 or t > rep_seconds * reps:
+        return 170.0
+    return 170.0 - (170.0 - bottom) * (1 - math.cos(2 * math.pi * t / rep_seconds)) / 2
+
+
+def count_reps(frame_step: int, rep_seconds: float = 1.8, reps: int = 3, bottom: float = 80.0) -> int:
+    segmenter = RepSegmenter(fps=FPS)
+    total_frames = int(FPS * (rep_seconds * reps + 1))
+    for frame_index in range(0, total_frames, frame_step):
+        segmenter.update(frame_index, squat_angle(frame_index / FPS - 0.5, rep_seconds, reps, bottom))
+    return segmenter.summary()["rep_count"]
+
+
+def test_counts_reps_at_default_frame_skip():
+    assert count_reps(config.DEFAULT_FRAME_SKIP) == 3
+
+
+@pytest.mark.parametrize("frame_step", [1, 5, 10, 15])
+@pytest.mark.parametrize("rep_seconds", [1.5, 2.0])
+def test_rep_count_does_not_depend_on_frame_skip(frame_step, rep_seconds):
+    assert count_reps(frame_step, rep_seconds) == 3
+
+
+def test_deep_squats_count_like_shallow_ones():
+    assert count_reps(config.DEFAULT_FRAME_SKIP, bottom=60.0) == count_reps(config.DEFAULT_FRAME_SKIP, bottom=110.0) == 3
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_concurrent_callers_with_the_same_key_share_one_computation():
+    flights = SingleFlight()
+    calls = []
+
+    async def compute(emit):
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flights.run("key", compute) for _ in range(3)))
+
+    assert asyncio.run(main()) == ["result"] * 3
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "started": 1, "joined": 2}
+
+
+def test_different_keys_run_separately():
+    flights = SingleFlight()
+
+    async def main():
+        async def compute(emit):
+            await asyncio.sleep(0)
+            return flights.in_flight
+
+        return await asyncio.gather(flights.run("a", compute), flights.run("b", compute))
+
+    assert asyncio.run(main()) == [2, 2]
+    assert flights.stats()["started"] == 2
+
+
+def test_errors_reach_every_caller_and_the_key_can_run_again():
+    flights = SingleFlight()
+
+    async def fail(emit):
+        await asyncio.sleep(0.01)
+        raise ValueError("no valid frames")
+
+    async def succeed(emit):
+        return "result"
+
+    async def main():
+        results = await asyncio.gather(*(flights.run("key", fail) for _ in range(2)), return_exceptions=True)
+        return results, await flights.run("key", succeed)
+
+    results, retried = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert retried == "result"
+
+
+def test_callers_receive_events_from_when_they_join():
+    flights = SingleFlight()
+    first, second = [], []
+
+    async def main():
+        started = asyncio.Event()
+
+        async def compute(emit):
+            emit("progress", {"frames": 1})
+            started.set()
+            await asyncio.sleep(0.01)
+            emit("progress", {"frames": 2})
+            return "result"
+
+        leader = asyncio.create_task(flights.run("key", compute, lambda name, data: first.append(data)))
+        await started.wait()
+        await flights.run("key", compute, lambda name, data: second.append(data))
+        await leader
+
+    asyncio.run(main())
+    assert first == [{"frames": 1}, {"frames": 2}]
+    assert second == [{"frames": 2}]
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others():
+    flights = SingleFlight()
+
+    async def compute(emit):
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def main():
+        leaving = asyncio.create_task(flights.run("key", compute))
+        staying = asyncio.create_task(flights.run("key", compute))
+        await asyncio.sleep(0.005)
+        leaving.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+        return await staying
+
+    assert asyncio.run(main()) == "result"
@@ -0,0 +1,23 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StageTimings:
+    """Collect wall-clock durations of named pipeline stages."""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = round(time.perf_counter() - start, 4)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return stage durations plus the total elapsed time, in seconds."""
+        return {**self.stages, "total": round(time.perf_counter() - self._start, 4)}
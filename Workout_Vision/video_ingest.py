@@ -0,0 +1,87 @@
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, Tuple
+
+import requests
+from fastapi import HTTPException
+
+import config
+from metrics import VIDEO_OPEN_SECONDS
+from http_clients import http_clients, with_retries_sync
+
+# OpenCV is imported inside the functions that use it, here and in the other frame and image modules,
+# so importing the service does not load it
+if TYPE_CHECKING:
+    import cv2
+
+logger = logging.getLogger(__name__)
+
+
+def download_video(url: str, max_bytes: int = config.MAX_VIDEO_BYTES) -> str:
+    """
+    Stream a video to a temporary file in HTTP_CHUNK_SIZE chunks and return its path.
+    Aborts as soon as the declared or received size exceeds `max_bytes`, so memory stays bounded.
+    """
+    def request() -> requests.Response:
+        response = http_clients.session.get(url, stream=True, timeout=config.HTTP_TIMEOUT)
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+        return response
+
+    # Only establishing the response is retried, a failure mid-body aborts the download
+    with with_retries_sync(request) as response:
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Video exceeds the maximum size of {max_bytes} bytes")
+
+        fd, path = tempfile.mkstemp(suffix=".mp4", prefix="video_", dir=config.VIDEO_TEMP_DIR)
+        received = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(chunk_size=config.HTTP_CHUNK_SIZE):
+                    received += len(chunk)
+                    if received > max_bytes:
+                        raise HTTPException(status_code=413, detail=f"Video exceeds the maximum size of {max_bytes} bytes")
+                    f.write(chunk)
+        except BaseException:
+            os.remove(path)
+            raise
+
+    logger.info(f"Downloaded {received} bytes to {path}")
+    return path
+
+
+@contextmanager
+def open_video_source(url: str) -> Iterator[Tuple[str, "cv2.VideoCapture"]]:
+    """
+    Open a video capture for a URL, streaming it directly when the backend supports it
+    and otherwise from a temporary file. Yields the source the capture was opened from,
+    which can be opened again for more captures, and the capture.
+    The capture and any temporary file are released on exit.
+    """
+    import cv2
+
+    path = None
+    with VIDEO_OPEN_SECONDS.time(source="direct"):
+        cap = cv2.VideoCapture(url)
+    try:
+        if not cap.isOpened():
+            # If direct URL capture fails, stream the video to disk and open it from there
+            logger.info("Direct URL capture failed, streaming video to a temporary file")
+            with VIDEO_OPEN_SECONDS.time(source="download"):
+                path = download_video(url)
+                cap = cv2.VideoCapture(path)
+
+            if not cap.isOpened():
+                raise HTTPException(status_code=400, detail="Error reading video from URL")
+
+        yield path or url, cap
+    finally:
+        cap.release()
+        if path is not None and os.path.exists(path):
+            os.remove(path)